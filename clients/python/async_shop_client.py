@@ -0,0 +1,303 @@
+import asyncio
+import httpx
+from typing import Dict, List, Optional, Any, Iterable
+
+from shop_client import ShopAPIError
+
+
+class AsyncShopClient:
+    """
+    Asyncio client for the Tandemx Shop API.
+
+    Mirrors ``ShopClient`` but every method is a coroutine. A semaphore caps the
+    number of requests in flight, so callers can ``asyncio.gather`` thousands of
+    calls without overwhelming the server or the connection pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = 30.0,
+        max_concurrency: int = 20,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Initialize the async shop client.
+
+        Args:
+            base_url: The base URL of the API (e.g., "http://localhost:8000")
+            api_key: Optional API key for authentication
+            timeout: Default request timeout in seconds (None waits forever)
+            max_concurrency: Maximum number of requests in flight at once
+            client: Optional existing httpx.AsyncClient to share; it is not closed
+                by this client
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+
+        if api_key:
+            self.headers['Authorization'] = f'Bearer {api_key}'
+
+        self._owns_client = client is None
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            )
+            client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> 'AsyncShopClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Release pooled connections held by the underlying httpx client."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """
+        Handle API response, raising exceptions for error responses.
+
+        Args:
+            response: The httpx Response object
+
+        Returns:
+            The parsed JSON response
+
+        Raises:
+            ShopAPIError: If the API returns an error (a ValueError subclass)
+        """
+        if not response.is_success:
+            try:
+                error_data = response.json()
+                error_message = error_data.get('error', f"HTTP {response.status_code}")
+            except Exception:
+                error_message = f"HTTP {response.status_code}: {response.text}"
+
+            raise ShopAPIError(f"API Error: {error_message}", response.status_code)
+
+        return response.json()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Send a request once a concurrency slot is free and parse the response.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL
+            **kwargs: Extra arguments passed to ``httpx.AsyncClient.request``
+
+        Returns:
+            The parsed JSON response
+        """
+        kwargs.setdefault('headers', self.headers)
+        async with self._semaphore:
+            response = await self.client.request(method, f"{self.base_url}{path}", **kwargs)
+        return self._handle_response(response)
+
+    # Product operations
+
+    async def get_products(self, page: int = 1, limit: int = 20) -> Dict[str, Any]:
+        """
+        Get a paginated list of products.
+
+        Args:
+            page: Page number (starting from 1)
+            limit: Number of items per page (max 100)
+
+        Returns:
+            Dict containing product data and pagination metadata
+        """
+        params = {'page': page, 'limit': limit}
+        return await self._request('GET', '/api/shop/products', params=params)
+
+    async def get_product(self, product_id: int) -> Dict[str, Any]:
+        """
+        Get a single product by ID.
+
+        Args:
+            product_id: The product ID
+
+        Returns:
+            Dict containing product data
+        """
+        return await self._request('GET', f'/api/shop/products/{product_id}')
+
+    async def create_product(
+        self,
+        name: str,
+        description: str,
+        price: float,
+        sku: str,
+        stock_quantity: int
+    ) -> Dict[str, Any]:
+        """
+        Create a new product.
+
+        Args:
+            name: Product name
+            description: Product description
+            price: Product price
+            sku: Stock keeping unit (unique identifier)
+            stock_quantity: Initial stock quantity
+
+        Returns:
+            Dict containing the created product data
+        """
+        data = {
+            'name': name,
+            'description': description,
+            'price': price,
+            'sku': sku,
+            'stock_quantity': stock_quantity
+        }
+        return await self._request('POST', '/api/shop/products', json=data)
+
+    # Order operations
+
+    async def create_order(
+        self,
+        items: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a new order.
+
+        Args:
+            items: List of order items, each containing product_id, quantity,
+                  unit_price, name, and sku
+            user_id: Optional user ID for registered users
+            idempotency_key: Optional key sent as the Idempotency-Key header so a
+                  replayed submission can be recognized by the server
+
+        Returns:
+            Dict containing the created order data
+        """
+        data = {
+            'items': items
+        }
+
+        if user_id is not None:
+            data['user_id'] = user_id
+
+        headers = self.headers
+        if idempotency_key is not None:
+            headers = dict(self.headers, **{'Idempotency-Key': idempotency_key})
+
+        return await self._request('POST', '/api/shop/orders', json=data, headers=headers)
+
+    async def get_order(self, order_id: int) -> Dict[str, Any]:
+        """
+        Get order details by ID.
+
+        Args:
+            order_id: The order ID
+
+        Returns:
+            Dict containing order data with items
+        """
+        return await self._request('GET', f'/api/shop/orders/{order_id}')
+
+    async def get_orders(self, page: int = 1, limit: int = 20) -> Dict[str, Any]:
+        """
+        Get a paginated list of orders.
+
+        Args:
+            page: Page number (starting from 1)
+            limit: Number of items per page (max 100)
+
+        Returns:
+            Dict containing order data and pagination metadata
+        """
+        params = {'page': page, 'limit': limit}
+        return await self._request('GET', '/api/shop/orders', params=params)
+
+    # Bulk helpers
+
+    async def get_products_many(
+        self,
+        product_ids: Iterable[int],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fetch many products concurrently.
+
+        Args:
+            product_ids: Product IDs to fetch
+            return_exceptions: If True, failed lookups are returned in place as
+                exceptions instead of raising the first error
+
+        Returns:
+            Products in the same order as ``product_ids``
+        """
+        return await asyncio.gather(
+            *(self.get_product(product_id) for product_id in product_ids),
+            return_exceptions=return_exceptions
+        )
+
+    async def get_orders_many(
+        self,
+        order_ids: Iterable[int],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fetch many orders concurrently.
+
+        Args:
+            order_ids: Order IDs to fetch
+            return_exceptions: If True, failed lookups are returned in place as
+                exceptions instead of raising the first error
+
+        Returns:
+            Orders in the same order as ``order_ids``
+        """
+        return await asyncio.gather(
+            *(self.get_order(order_id) for order_id in order_ids),
+            return_exceptions=return_exceptions
+        )
+
+    async def get_product_pages(
+        self,
+        pages: Iterable[int],
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch several product pages concurrently.
+
+        Args:
+            pages: Page numbers to fetch
+            limit: Number of items per page (max 100)
+
+        Returns:
+            Page responses in the same order as ``pages``
+        """
+        return await asyncio.gather(
+            *(self.get_products(page=page, limit=limit) for page in pages)
+        )
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main() -> None:
+        async with AsyncShopClient("http://localhost:8000", max_concurrency=10) as client:
+            try:
+                products = await client.get_products_many(range(1, 51), return_exceptions=True)
+                found = [p for p in products if not isinstance(p, Exception)]
+                print(f"Fetched {len(found)} of {len(products)} products")
+            except httpx.HTTPError as e:
+                print(f"Error: {e}")
+
+    asyncio.run(main())
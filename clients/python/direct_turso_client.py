@@ -19,7 +19,9 @@ class TursoClient:
         database_url: Optional[str] = None,
         auth_token: Optional[str] = None,
         db_name: Optional[str] = None,
-        local_path: str = "tandemx.db"
+        local_path: str = "tandemx.db",
+        http_client: Optional[httpx.Client] = None,
+        use_env: bool = True
     ):
         """
         Initialize the Turso client.
@@ -29,13 +31,19 @@ class TursoClient:
             auth_token: Turso authentication token
             db_name: Turso database name
             local_path: Path to local SQLite database (used if no remote connection info provided)
+            http_client: Optional shared httpx client; when given, remote queries reuse its
+                connection pool instead of opening a new client per query
+            use_env: Fill missing connection settings from the TURSO_* environment
+                variables; disable when the caller supplies the exact target
         """
-        self.database_url = database_url or os.environ.get("TURSO_DATABASE_URL")
-        self.auth_token = auth_token or os.environ.get("TURSO_AUTH_TOKEN")
-        self.db_name = db_name or os.environ.get("TURSO_DB_NAME")
+        env = os.environ if use_env else {}
+        self.database_url = database_url or env.get("TURSO_DATABASE_URL")
+        self.auth_token = auth_token or env.get("TURSO_AUTH_TOKEN")
+        self.db_name = db_name or env.get("TURSO_DB_NAME")
         self.local_path = local_path
         self.connection = None
         self.is_remote = False
+        self.http_client = http_client
         
         # Try to connect
         self._connect()
@@ -56,7 +64,12 @@ class TursoClient:
         
         if not self.is_remote:
             # Local SQLite connection
-            self.connection = sqlite3.connect(self.database_url.replace("file:", ""))
+            # Allow use from worker threads; callers sharing a client across threads
+            # (e.g. TursoRouter fan-out) serialize access themselves
+            self.connection = sqlite3.connect(
+                self.database_url.replace("file:", ""),
+                check_same_thread=False
+            )
             self.connection.row_factory = sqlite3.Row
         # For remote, we'll use HTTP for each query, so no persistent connection needed
     
@@ -98,19 +111,27 @@ class TursoClient:
             "params": converted_params
         }
         
-        # Make request
-        with httpx.Client() as client:
-            response = client.post(
+        # Make request, reusing the shared client's connection pool when available
+        if self.http_client is not None:
+            response = self.http_client.post(
                 f"{self.database_url}/execute",
                 json=data,
                 headers=headers,
                 timeout=30.0
             )
+        else:
+            with httpx.Client() as client:
+                response = client.post(
+                    f"{self.database_url}/execute",
+                    json=data,
+                    headers=headers,
+                    timeout=30.0
+                )
+        
+        if response.status_code != 200:
+            raise Exception(f"Query failed: {response.status_code} - {response.text}")
             
-            if response.status_code != 200:
-                raise Exception(f"Query failed: {response.status_code} - {response.text}")
-                
-            return response.json()
+        return response.json()
     
     def _local_query(self, query: str, params: List[Any] = None) -> Dict[str, Any]:
         """Execute a query via local SQLite connection"""
@@ -311,7 +332,7 @@ class TursoClient:
                 
                 # Update product stock
                 self.execute(
-                    "UPDATE products SET stock_quantity = stock_quantity - ? WHERE id = ?",
+                    "UPDATE products SET stock_quantity = stock_quantity - ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                     [item["quantity"], item["product_id"]]
                 )
         else:
@@ -343,7 +364,7 @@ class TursoClient:
                     
                     # Update product stock
                     cursor.execute(
-                        "UPDATE products SET stock_quantity = stock_quantity - ? WHERE id = ?",
+                        "UPDATE products SET stock_quantity = stock_quantity - ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                         [item["quantity"], item["product_id"]]
                     )
                 
@@ -0,0 +1,250 @@
+import os
+import json
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+
+class CacheEntry:
+    """A cached response body with its validators"""
+
+    __slots__ = ('body', 'etag', 'last_modified')
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that revalidate this entry with the server"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Client-side HTTP cache for conditional GET requests.
+
+    Response bodies are stored with their ``ETag``/``Last-Modified`` validators
+    in an LRU bounded by entry count and total body size. When ``directory`` is
+    given, entries are also written to disk so they survive restarts; disk
+    entries are loaded back into memory on first use. The directory keeps at
+    most ``max_entries`` files, dropping the least recently written or read,
+    and file I/O happens outside the cache lock.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        directory: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory, and on disk
+            max_bytes: Maximum total size of response bodies kept in memory
+            directory: Optional directory for the on-disk copy of the cache
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        # File names in the directory, least recently used first
+        self._files: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            # Files from earlier runs, oldest first; trimmed on the next put
+            names = [name for name in os.listdir(directory) if name.endswith('.json')]
+            names.sort(key=lambda name: self._mtime(os.path.join(directory, name)))
+            self._files = OrderedDict.fromkeys(names)
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the bodies held in memory"""
+        return self._size
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json'
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, self._file_name(key))
+
+    def _touch_file(self, key: str) -> List[str]:
+        """Mark a key's file as most recently used; returns file names to delete (lock held)"""
+        name = self._file_name(key)
+        self._files[name] = None
+        self._files.move_to_end(name)
+        evicted = []
+        while len(self._files) > self.max_entries:
+            evicted.append(self._files.popitem(last=False)[0])
+        return evicted
+
+    def _remove_files(self, names: List[str]) -> None:
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """Insert into the in-memory LRU and evict down to the limits (lock held)"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.body)
+
+        # Bodies larger than the whole budget are only kept on disk
+        if len(entry.body) > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._size += len(entry.body)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._size > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key (see ``make_key``)
+
+        Returns:
+            The cache entry, or None if the key is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if not self.directory:
+            return None
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        entry = CacheEntry(
+            stored['body'].encode('utf-8'),
+            stored.get('etag'),
+            stored.get('last_modified')
+        )
+        with self._lock:
+            self._store(key, entry)
+            evicted = self._touch_file(key)
+        self._remove_files(evicted)
+        return entry
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store a response body with its validators.
+
+        Responses without an ``ETag`` or ``Last-Modified`` header cannot be
+        revalidated and are ignored.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            body: Raw response body
+            etag: Value of the ``ETag`` response header
+            last_modified: Value of the ``Last-Modified`` response header
+        """
+        if not etag and not last_modified:
+            return
+
+        entry = CacheEntry(body, etag, last_modified)
+        with self._lock:
+            self._store(key, entry)
+
+        if not self.directory:
+            return
+
+        stored = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body.decode('utf-8')
+        }
+        # Unique per write, as several threads may store the same key at once
+        tmp_path = f"{self._path(key)}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            self._remove_files([os.path.basename(tmp_path)])
+            return
+
+        with self._lock:
+            evicted = self._touch_file(key)
+        self._remove_files(evicted)
+
+    def record(self, hit: bool) -> None:
+        """Count a revalidation outcome (304 hit or full download)"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        """Drop every cached response, including the on-disk copies"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._files.clear()
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith('.json'):
+                        os.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key from a URL and query parameters.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            A key that is stable regardless of parameter order
+        """
+        if not params:
+            return url
+        query = '&'.join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{url}?{query}"
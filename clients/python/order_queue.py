@@ -0,0 +1,392 @@
+import sys
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import requests
+from typing import Dict, List, Any, Optional, Tuple
+
+from shop_client import ShopAPIError
+
+# Order states in the queue
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class OfflineOrderQueue:
+    """
+    Durable local queue for orders placed while the shop API may be unreachable.
+
+    ``submit`` writes the order to an SQLite file and returns immediately with
+    its idempotency key, so checkout never waits on the network. A background
+    worker replays pending orders in batches through ``ShopClient.create_order``,
+    sending the key as the ``Idempotency-Key`` header. Connection errors, 429
+    and 5xx responses leave orders pending for the next pass; other API errors
+    mark them failed so they can be reviewed.
+
+    Each batch is claimed (moved to ``sending``) in one statement before it is
+    sent, so the worker, ``drain()`` and other processes sharing the file never
+    send the same order twice. A claim left behind by a replayer that died
+    mid-batch expires after ``claim_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: str = "order_queue.db",
+        batch_size: int = 20,
+        retry_interval: float = 5.0,
+        max_retry_interval: float = 300.0,
+        claim_timeout: float = 600.0
+    ):
+        """
+        Initialize the queue and create its table if needed.
+
+        Args:
+            client: ShopClient used to replay orders
+            path: Path to the SQLite queue file
+            batch_size: Maximum number of orders replayed per pass
+            retry_interval: Seconds between passes while orders are pending
+            max_retry_interval: Longest wait between passes while the API is unreachable
+            claim_timeout: Seconds after which orders claimed by a replayer that
+                never finished become pending again
+        """
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.claim_timeout = claim_timeout
+        self.last_error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL keeps submits from blocking the replay reads; FULL syncs each
+        # commit, so a queued sale survives a power cut right after submit
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS queued_orders (
+                id INTEGER PRIMARY KEY,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                order_id INTEGER,
+                created_at REAL NOT NULL,
+                sent_at REAL,
+                claimed_at REAL
+            )
+        """)
+        # Queue files created before claims existed lack the column
+        columns = [row['name'] for row in self.connection.execute("PRAGMA table_info(queued_orders)")]
+        if 'claimed_at' not in columns:
+            self.connection.execute("ALTER TABLE queued_orders ADD COLUMN claimed_at REAL")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queued_orders_status ON queued_orders (status, id)"
+        )
+        self.connection.commit()
+
+    def __enter__(self) -> 'OfflineOrderQueue':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def submit(
+        self,
+        items: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None
+    ) -> str:
+        """
+        Queue an order for delivery.
+
+        Args:
+            items: List of order items, as accepted by ``ShopClient.create_order``
+            user_id: Optional user ID for registered users
+            idempotency_key: Key identifying the order (a UUID is generated if None)
+
+        Returns:
+            The order's idempotency key
+        """
+        key = idempotency_key or str(uuid.uuid4())
+        payload = json.dumps({'items': items, 'user_id': user_id})
+
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO queued_orders (idempotency_key, payload, created_at) "
+                "VALUES (?, ?, ?)",
+                [key, payload, time.time()]
+            )
+            self.connection.commit()
+
+        self._wake.set()
+        return key
+
+    def get(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a queued order.
+
+        Args:
+            idempotency_key: The order's idempotency key
+
+        Returns:
+            Dict with the order's queue state, or None if unknown
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT * FROM queued_orders WHERE idempotency_key = ?",
+                [idempotency_key]
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Summarize the queue.
+
+        Returns:
+            Dict with counts per state, the age in seconds of the oldest pending
+            order, whether the worker is running and the last replay error
+        """
+        with self._lock:
+            counts = dict(self.connection.execute(
+                "SELECT status, COUNT(*) FROM queued_orders GROUP BY status"
+            ).fetchall())
+            oldest = self.connection.execute(
+                "SELECT MIN(created_at) FROM queued_orders WHERE status = ?",
+                [PENDING]
+            ).fetchone()[0]
+
+        return {
+            'pending': counts.get(PENDING, 0),
+            'sending': counts.get(SENDING, 0),
+            'sent': counts.get(SENT, 0),
+            'failed': counts.get(FAILED, 0),
+            'oldest_pending_age': time.time() - oldest if oldest else None,
+            'running': self._worker is not None and self._worker.is_alive(),
+            'last_error': self.last_error
+        }
+
+    def failed_orders(self) -> List[Dict[str, Any]]:
+        """Orders the API rejected, oldest first"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT * FROM queued_orders WHERE status = ? ORDER BY id",
+                [FAILED]
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def retry_failed(self) -> int:
+        """
+        Move failed orders back to pending.
+
+        Returns:
+            Number of orders requeued
+        """
+        with self._lock:
+            cursor = self.connection.execute(
+                "UPDATE queued_orders SET status = ? WHERE status = ?",
+                [PENDING, FAILED]
+            )
+            self.connection.commit()
+        self._wake.set()
+        return cursor.rowcount
+
+    def _claim(self) -> List[sqlite3.Row]:
+        """Atomically move the next batch of pending (or abandoned) orders to sending"""
+        now = time.time()
+        with self._lock:
+            rows = self.connection.execute(
+                "UPDATE queued_orders SET status = ?, claimed_at = ? WHERE id IN ("
+                "  SELECT id FROM queued_orders"
+                "  WHERE status = ? OR (status = ? AND claimed_at < ?)"
+                "  ORDER BY id LIMIT ?"
+                ") RETURNING id, idempotency_key, payload",
+                [SENDING, now, PENDING, SENDING, now - self.claim_timeout, self.batch_size]
+            ).fetchall()
+            self.connection.commit()
+        return sorted(rows, key=lambda row: row['id'])
+
+    def _release(self, row_ids: List[int]) -> None:
+        """Return claimed orders that were not sent to pending"""
+        if not row_ids:
+            return
+        with self._lock:
+            self.connection.executemany(
+                "UPDATE queued_orders SET status = ?, claimed_at = NULL WHERE id = ? AND status = ?",
+                [[PENDING, row_id, SENDING] for row_id in row_ids]
+            )
+            self.connection.commit()
+
+    def replay(self) -> int:
+        """
+        Claim and send one batch of pending orders.
+
+        Returns:
+            Number of orders delivered
+
+        Raises:
+            requests.RequestException or ShopAPIError: If the API is unreachable or
+                overloaded; the unsent orders of the batch go back to pending
+        """
+        return self._replay_batch()[1]
+
+    def _replay_batch(self) -> Tuple[int, int]:
+        """Claim and send one batch; returns (orders claimed, orders delivered)"""
+        rows = self._claim()
+
+        delivered = 0
+        for i, row in enumerate(rows):
+            try:
+                payload = json.loads(row['payload'])
+                order = self.client.create_order(
+                    payload['items'],
+                    user_id=payload.get('user_id'),
+                    idempotency_key=row['idempotency_key']
+                )
+            except ShopAPIError as e:
+                if e.status_code == 429 or e.status_code >= 500:
+                    self._record_attempt(row['id'], str(e))
+                    self._release([r['id'] for r in rows[i:]])
+                    raise
+                self._mark(row['id'], FAILED, error=str(e))
+                continue
+            except requests.RequestException as e:
+                self._record_attempt(row['id'], str(e))
+                self._release([r['id'] for r in rows[i:]])
+                raise
+            except BaseException:
+                self._release([r['id'] for r in rows[i:]])
+                raise
+
+            # The client may return a raw dict or an Order model; the order was
+            # accepted either way, so an odd response must not get it resent
+            order_id = order.get('id') if isinstance(order, dict) else getattr(order, 'id', None)
+            self._mark(row['id'], SENT, order_id=order_id)
+            delivered += 1
+
+        return len(rows), delivered
+
+    def drain(self) -> int:
+        """
+        Replay pending orders until none are left or the API becomes unreachable.
+
+        Returns:
+            Number of orders delivered
+        """
+        total = 0
+        while True:
+            try:
+                claimed, delivered = self._replay_batch()
+            except (requests.RequestException, ShopAPIError):
+                return total
+            total += delivered
+            # A batch the API rejected outright still made progress
+            if claimed == 0 or self.status()['pending'] == 0:
+                return total
+
+    def start(self) -> None:
+        """Start replaying pending orders on a background thread"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="order-queue", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background replay thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def close(self) -> None:
+        """Stop replaying and close the queue file"""
+        self.stop()
+        with self._lock:
+            self.connection.close()
+
+    def _run(self) -> None:
+        interval = self.retry_interval
+        while not self._stop.is_set():
+            try:
+                claimed, _ = self._replay_batch()
+                pending = self.status()['pending']
+            except Exception as e:
+                # Back off while the API is down so the POS isn't spinning on it;
+                # unexpected errors (a bad response, a locked queue file) back off
+                # too instead of ending the worker
+                if not isinstance(e, (requests.RequestException, ShopAPIError)):
+                    print(f"WARNING: Order queue replay failed: {e!r}", file=sys.stderr)
+                self.last_error = str(e)
+                self._wake.wait(interval)
+                self._wake.clear()
+                interval = min(self.max_retry_interval, interval * 2)
+                continue
+
+            self.last_error = None
+            interval = self.retry_interval
+            if claimed and pending:
+                # More batches are waiting and the API is reachable
+                continue
+
+            self._wake.wait(self.retry_interval if pending else None)
+            self._wake.clear()
+
+    def _record_attempt(self, row_id: int, error: str) -> None:
+        with self._lock:
+            self.connection.execute(
+                "UPDATE queued_orders SET status = ?, claimed_at = NULL, attempts = attempts + 1, "
+                "last_error = ? WHERE id = ?",
+                [PENDING, error, row_id]
+            )
+            self.connection.commit()
+
+    def _mark(
+        self,
+        row_id: int,
+        status: str,
+        error: Optional[str] = None,
+        order_id: Optional[int] = None
+    ) -> None:
+        with self._lock:
+            self.connection.execute(
+                "UPDATE queued_orders SET status = ?, claimed_at = NULL, attempts = attempts + 1, "
+                "last_error = ?, order_id = ?, sent_at = ? WHERE id = ?",
+                [status, error, order_id, time.time() if status == SENT else None, row_id]
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        result = dict(row)
+        payload = json.loads(result.pop('payload'))
+        result['items'] = payload['items']
+        result['user_id'] = payload.get('user_id')
+        return result
+
+
+# Example usage
+if __name__ == "__main__":
+    from shop_client import ShopClient
+
+    client = ShopClient("http://localhost:8000", timeout=5.0)
+    with OfflineOrderQueue(client, path="pos_orders.db") as queue:
+        key = queue.submit([
+            {"product_id": 1, "quantity": 2, "unit_price": 19.99, "name": "Test Product", "sku": "TEST-123"}
+        ])
+        print(f"Queued order {key}")
+        queue.drain()
+        print(queue.status())
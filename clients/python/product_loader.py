@@ -0,0 +1,298 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+
+class ProductLoader:
+    """
+    Coalesces ``ShopClient.get_product`` calls.
+
+    Calls to ``load`` made within ``batch_window`` seconds of each other are
+    collected, duplicate IDs are merged, and each distinct product is fetched
+    once on a bounded thread pool. Every caller gets a future for its product.
+    With ``cache=True`` resolved products are memoized for the loader's
+    lifetime, so one loader per request or render pass is the intended scope.
+
+    The shop API has no bulk product endpoint, so a batch is issued as a
+    bounded set of concurrent single-product fetches.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        batch_window: float = 0.005,
+        max_concurrency: int = 8,
+        cache: bool = True
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            client: ShopClient (or any object with ``get_product(product_id)``)
+            batch_window: Seconds to wait for more calls before dispatching a batch
+            max_concurrency: Maximum number of product fetches in flight
+            cache: Keep resolved products for later ``load`` calls
+        """
+        self.client = client
+        self.batch_window = batch_window
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._futures: Dict[int, Future] = {}
+        self._queue: List[int] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.requests_made = 0
+
+    def __enter__(self) -> 'ProductLoader':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def load(self, product_id: int) -> Future:
+        """
+        Request a product; the fetch is deferred until the current batch dispatches.
+
+        Args:
+            product_id: The product ID
+
+        Returns:
+            Future resolving to the product dict (or raising the fetch error)
+        """
+        with self._lock:
+            future = self._futures.get(product_id)
+            # A caller may have cancelled the shared future; start over then
+            if future is not None and not future.cancelled():
+                return future
+
+            future = Future()
+            self._futures[product_id] = future
+            self._queue.append(product_id)
+
+            if self._timer is None:
+                self._timer = threading.Timer(self.batch_window, self._dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+
+            return future
+
+    def load_many(self, product_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Load several products as one batch and wait for all of them.
+
+        Args:
+            product_ids: Product IDs to load
+
+        Returns:
+            Products in the same order as ``product_ids``
+        """
+        futures = [self.load(product_id) for product_id in product_ids]
+        self.flush()
+        return [future.result() for future in futures]
+
+    def get(self, product_id: int) -> Dict[str, Any]:
+        """Load a single product and wait for it"""
+        return self.load(product_id).result()
+
+    def flush(self) -> None:
+        """Dispatch the pending batch now instead of waiting for the batch window"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self._dispatch()
+
+    def clear(self, product_id: Optional[int] = None) -> None:
+        """
+        Forget memoized products so the next ``load`` refetches them.
+
+        Args:
+            product_id: Product to forget (forgets every resolved product if None)
+        """
+        with self._lock:
+            if product_id is not None:
+                future = self._futures.get(product_id)
+                if future is not None and future.done():
+                    del self._futures[product_id]
+            else:
+                for key in [key for key, future in self._futures.items() if future.done()]:
+                    del self._futures[key]
+
+    def close(self) -> None:
+        """Dispatch anything still pending and shut down the fetch pool"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            # An ID reloaded after its future was cancelled is queued twice
+            batch = list(dict.fromkeys(self._queue))
+            self._queue = []
+            self._timer = None
+
+        for product_id in batch:
+            self.requests_made += 1
+            self._executor.submit(self._fetch, product_id)
+
+    def _forget(self, product_id: int, future: Future) -> None:
+        with self._lock:
+            if self._futures.get(product_id) is future:
+                del self._futures[product_id]
+
+    def _fetch(self, product_id: int) -> None:
+        with self._lock:
+            future = self._futures.get(product_id)
+        # Skip products whose future was cancelled before the fetch started
+        if future is None or not future.set_running_or_notify_cancel():
+            if future is not None:
+                self._forget(product_id, future)
+            return
+
+        try:
+            product = self.client.get_product(product_id)
+        except Exception as e:
+            # Failures are never memoized so a later load can retry
+            self._forget(product_id, future)
+            future.set_exception(e)
+            return
+
+        if not self.cache:
+            self._forget(product_id, future)
+        future.set_result(product)
+
+
+class AsyncProductLoader:
+    """
+    Coalesces ``AsyncShopClient.get_product`` calls on the running event loop.
+
+    Behaves like ``ProductLoader``; concurrency is bounded by the client's own
+    ``max_concurrency`` limit.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        batch_window: float = 0.002,
+        cache: bool = True
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            client: AsyncShopClient (or any object with a ``get_product`` coroutine)
+            batch_window: Seconds to wait for more calls before dispatching a batch
+            cache: Keep resolved products for later ``load`` calls
+        """
+        self.client = client
+        self.batch_window = batch_window
+        self.cache = cache
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._queue: List[int] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests_made = 0
+
+    def load(self, product_id: int) -> asyncio.Future:
+        """
+        Request a product; must be called from the event loop.
+
+        Args:
+            product_id: The product ID
+
+        Returns:
+            Awaitable future resolving to the product dict
+        """
+        future = self._futures.get(product_id)
+        # A caller may have cancelled the shared future; start over then
+        if future is not None and not future.cancelled():
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[product_id] = future
+        self._queue.append(product_id)
+
+        if self._handle is None:
+            self._handle = loop.call_later(self.batch_window, self._dispatch)
+
+        return future
+
+    async def load_many(self, product_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Load several products as one batch.
+
+        Args:
+            product_ids: Product IDs to load
+
+        Returns:
+            Products in the same order as ``product_ids``
+        """
+        return list(await asyncio.gather(*(self.load(product_id) for product_id in product_ids)))
+
+    def clear(self, product_id: Optional[int] = None) -> None:
+        """
+        Forget memoized products so the next ``load`` refetches them.
+
+        Args:
+            product_id: Product to forget (forgets every resolved product if None)
+        """
+        if product_id is not None:
+            future = self._futures.get(product_id)
+            if future is not None and future.done():
+                del self._futures[product_id]
+        else:
+            for key in [key for key, future in self._futures.items() if future.done()]:
+                del self._futures[key]
+
+    def _dispatch(self) -> None:
+        # An ID reloaded after its future was cancelled is queued twice
+        batch = list(dict.fromkeys(self._queue))
+        self._queue = []
+        self._handle = None
+
+        for product_id in batch:
+            future = self._futures.get(product_id)
+            if future is None or future.cancelled():
+                self._forget(product_id, future)
+                continue
+            self.requests_made += 1
+            task = asyncio.ensure_future(self._fetch(product_id, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _forget(self, product_id: int, future: Optional[asyncio.Future]) -> None:
+        if future is not None and self._futures.get(product_id) is future:
+            del self._futures[product_id]
+
+    async def _fetch(self, product_id: int, future: asyncio.Future) -> None:
+        try:
+            product = await self.client.get_product(product_id)
+        except asyncio.CancelledError:
+            self._forget(product_id, future)
+            future.cancel()
+            raise
+        except Exception as e:
+            self._forget(product_id, future)
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        if not self.cache or future.cancelled():
+            self._forget(product_id, future)
+        if not future.done():
+            future.set_result(product)
+
+
+# Example usage
+if __name__ == "__main__":
+    from shop_client import ShopClient
+
+    with ShopClient("http://localhost:8000") as client, ProductLoader(client) as loader:
+        cart = [{"product_id": 1, "quantity": 2}, {"product_id": 2, "quantity": 1},
+                {"product_id": 1, "quantity": 1}]
+        try:
+            products = loader.load_many(item["product_id"] for item in cart)
+            print(f"Resolved {len(products)} cart lines with {loader.requests_made} requests")
+        except ValueError as e:
+            print(f"Error: {e}")
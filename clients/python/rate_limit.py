@@ -0,0 +1,192 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Status codes that mean the server is overloaded and clients should slow down
+OVERLOAD_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header into seconds.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 10.0) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay for the first retry in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveThrottle:
+    """
+    Client-side rate limiter with adaptive concurrency.
+
+    Requests first take a token from a token bucket refilled at ``rate`` per
+    second, then wait for a concurrency slot. The concurrency limit follows
+    AIMD: it grows by roughly one slot per limit's worth of healthy responses
+    and is multiplied by ``decrease_factor`` when the server answers 429/503
+    or a request fails. Requests already in flight at the last decrease don't
+    decrease it again, so a burst of overload responses backs off once per
+    round trip rather than once per response. ``Retry-After`` pauses all
+    callers.
+
+    A response is healthy when its latency stays within ``latency_tolerance``
+    times the lowest latency seen in the last one to two ``baseline_window``
+    periods (or under ``target_latency`` if set). Safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        decrease_factor: float = 0.5,
+        target_latency: Optional[float] = None,
+        latency_tolerance: float = 2.0,
+        baseline_window: float = 30.0
+    ):
+        """
+        Initialize the throttle.
+
+        Args:
+            rate: Requests per second allowed by the token bucket (None for no rate limit)
+            burst: Token bucket capacity (defaults to ``rate`` rounded up)
+            initial_concurrency: Starting concurrency limit
+            min_concurrency: Lowest concurrency limit after backing off
+            max_concurrency: Highest concurrency limit when ramping up
+            decrease_factor: Multiplier applied to the limit on overload
+            target_latency: Latency in seconds considered healthy (adaptive if None)
+            latency_tolerance: Allowed multiple of the baseline latency when adaptive
+            baseline_window: Seconds after which the lowest latency seen is
+                forgotten, so the baseline can follow a lasting change in speed
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else (max(1, int(rate + 0.999)) if rate else 0)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+
+        self.limit = float(max(min_concurrency, min(initial_concurrency, max_concurrency)))
+        self.in_flight = 0
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        # Lowest latency in the current and the previous baseline window
+        self._window_start = time.monotonic()
+        self._window_min: Optional[float] = None
+        self._previous_min: Optional[float] = None
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Current whole-number concurrency limit"""
+        return max(self.min_concurrency, int(self.limit))
+
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            elapsed = now - self._last_refill
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """Block until a token and a concurrency slot are available"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._paused_until - now
+                if wait <= 0 and self.rate and self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                if wait <= 0 and self.in_flight >= self.concurrency_limit:
+                    # Woken by release()
+                    wait = None
+
+                if wait is not None and wait <= 0:
+                    if self.rate:
+                        self._tokens -= 1
+                    self.in_flight += 1
+                    return
+
+                self._condition.wait(wait)
+
+    def _is_healthy(self, latency: float, now: float) -> bool:
+        if self.target_latency is not None:
+            return latency <= self.target_latency
+
+        # A windowed minimum, like TCP's min-RTT: slow responses never raise it,
+        # so latency creeping up under load keeps counting as unhealthy
+        if now - self._window_start >= self.baseline_window:
+            self._previous_min, self._window_min = self._window_min, None
+            self._window_start = now
+        if self._window_min is None or latency < self._window_min:
+            self._window_min = latency
+        baseline = self._window_min
+        if self._previous_min is not None:
+            baseline = min(baseline, self._previous_min)
+        return latency <= baseline * self.latency_tolerance
+
+    def release(
+        self,
+        latency: float,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Return a concurrency slot and feed the outcome into the limit.
+
+        Args:
+            latency: Request duration in seconds
+            status_code: Response status, or None if the request failed to complete
+            retry_after: Seconds the server asked clients to wait, if any
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if status_code is None or status_code in OVERLOAD_STATUSES:
+                # Only requests sent after the last decrease saw its effect
+                if now - latency >= self._last_decrease:
+                    self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif status_code < 500 and self._is_healthy(latency, now):
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
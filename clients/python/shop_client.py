@@ -1,22 +1,78 @@
 import json
+import time
 import requests
-from typing import Dict, List, Optional, Tuple, Any, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any, Union
+
+from http_cache import ResponseCache
+from rate_limit import AdaptiveThrottle, backoff_delay, parse_retry_after
+from shop_models import Order, Page, Product, loads
+
+# Statuses worth retrying for idempotent requests
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Largest page the API serves; it answers any other limit with 20 items
+MAX_PAGE_SIZE = 100
+
+
+class ShopAPIError(ValueError):
+    """An error response from the shop API, carrying its HTTP status code."""
+    
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
 
 class ShopClient:
     """
     Python client for the Tandemx Shop API.
     """
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = 30.0,
+        pool_size: int = 10,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        throttle: Optional[AdaptiveThrottle] = None,
+        max_retries: int = 2,
+        max_retry_wait: float = 30.0,
+        models: bool = False,
+        lazy_pages: bool = True
+    ):
         """
         Initialize the shop client with the base URL and optional API key.
         
         Args:
             base_url: The base URL of the API (e.g., "http://localhost:8000")
             api_key: Optional API key for authentication
+            timeout: Default request timeout in seconds (None waits forever)
+            pool_size: Number of keep-alive connections kept per host
+            session: Optional existing session to share; it is not closed by this client
+            cache: Optional response cache; product reads then send conditional
+                requests and reuse the cached body when the server answers 304
+            throttle: Optional rate limiter / adaptive concurrency controller shared
+                by every request made through this client
+            max_retries: Retries for GET requests that fail with a connection error,
+                429 or 5xx gateway/availability errors
+            max_retry_wait: Upper bound in seconds on a single wait between retries,
+                including waits requested via Retry-After
+            models: Return Product/Order/Page models instead of raw dicts
+            lazy_pages: With ``models``, build page items on first access (saves
+                decoding time for rows that are never read, not memory)
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+        self.throttle = throttle
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.models = models
+        self.lazy_pages = lazy_pages
         self.headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
@@ -24,6 +80,115 @@ class ShopClient:
         
         if api_key:
             self.headers['Authorization'] = f'Bearer {api_key}'
+        
+        # One pooled session keeps connections alive across every call
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+    
+    def __enter__(self) -> 'ShopClient':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release pooled connections held by the client's session."""
+        if self._owns_session:
+            self.session.close()
+    
+    def _request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session with the default headers and timeout.
+        
+        Requests pass through the throttle when one is configured. GET requests
+        are retried on connection errors and on 429/502/503/504, honoring the
+        server's Retry-After header; other methods are never retried since they
+        are not idempotent.
+        
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL
+            **kwargs: Extra arguments passed to ``requests.Session.request``
+            
+        Returns:
+            The requests Response object
+        """
+        kwargs.setdefault('headers', self.headers)
+        kwargs.setdefault('timeout', self.timeout)
+        url = f"{self.base_url}{path}"
+        attempts = self.max_retries + 1 if method.upper() == 'GET' else 1
+        
+        for attempt in range(attempts):
+            if self.throttle is not None:
+                self.throttle.acquire()
+            start = time.monotonic()
+            
+            # The slot is returned whatever happens; a failed send counts as an
+            # overload signal (status None)
+            response = status_code = retry_after = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                status_code = response.status_code
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt + 1 >= attempts:
+                    raise
+            finally:
+                if self.throttle is not None:
+                    self.throttle.release(time.monotonic() - start, status_code, retry_after)
+            
+            if response is None:
+                time.sleep(min(self.max_retry_wait, backoff_delay(attempt)))
+                continue
+            
+            if response.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                return response
+            
+            if retry_after is None:
+                retry_after = backoff_delay(attempt)
+            time.sleep(min(self.max_retry_wait, retry_after))
+        
+        return response
+    
+    def _cached_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET a resource, revalidating against the response cache when one is configured.
+        
+        Args:
+            path: API path relative to the base URL
+            params: Query parameters
+            
+        Returns:
+            The parsed JSON response, from the cache if the server answered 304
+        """
+        if self.cache is None:
+            return self._handle_response(self._request('GET', path, params=params))
+        
+        key = ResponseCache.make_key(f"{self.base_url}{path}", params)
+        entry = self.cache.get(key)
+        headers = self.headers
+        if entry is not None:
+            headers = dict(self.headers, **entry.conditional_headers())
+        
+        response = self._request('GET', path, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record(hit=True)
+            return loads(entry.body)
+        
+        self.cache.record(hit=False)
+        data = self._handle_response(response)
+        self.cache.put(
+            key,
+            response.content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        return data
     
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """
@@ -36,7 +201,7 @@ class ShopClient:
             The parsed JSON response
             
         Raises:
-            ValueError: If the API returns an error
+            ShopAPIError: If the API returns an error (a ValueError subclass)
         """
         if not response.ok:
             try:
@@ -45,13 +210,98 @@ class ShopClient:
             except Exception:
                 error_message = f"HTTP {response.status_code}: {response.text}"
             
-            raise ValueError(f"API Error: {error_message}")
+            raise ShopAPIError(f"API Error: {error_message}", response.status_code)
+        
+        # Decode with orjson when it is installed
+        return loads(response.content)
+    
+    def _as_model(self, data: Dict[str, Any], model: type) -> Any:
+        """Wrap a decoded response in a model when models are enabled"""
+        if not self.models:
+            return data
+        return model.from_dict(data)
+    
+    def _as_page(self, data: Dict[str, Any], model: type) -> Any:
+        """Wrap a decoded list response in a Page when models are enabled"""
+        if not self.models:
+            return data
+        return Page.from_dict(data, model, lazy=self.lazy_pages)
+    
+    def _iter_pages(
+        self,
+        fetch_page: Callable[[int, int], Dict[str, Any]],
+        limit: int,
+        prefetch: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the items of consecutive pages, fetching upcoming pages in the background.
+        
+        At most ``prefetch`` pages are requested ahead of the one being consumed,
+        which bounds memory use. Iteration stops at the first short page, so up to
+        ``prefetch`` requests past the end of the collection may be wasted.
+        
+        Args:
+            fetch_page: Callable taking (page, limit) and returning a page response
+            limit: Number of items per page (max 100)
+            prefetch: Number of pages to fetch ahead (0 fetches sequentially)
+            
+        Returns:
+            Iterator over the items from the ``data`` list of each page, in order
+            
+        Raises:
+            ValueError: If ``limit`` is outside 1..100, since the API would
+                serve 20-item pages and the first one would look like the end
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"Page limit must be between 1 and {MAX_PAGE_SIZE}, got {limit}")
+        return self._walk_pages(fetch_page, limit, prefetch)
+    
+    def _walk_pages(
+        self,
+        fetch_page: Callable[[int, int], Dict[str, Any]],
+        limit: int,
+        prefetch: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Generator behind _iter_pages, so the limit is checked when iteration is set up"""
+        if prefetch <= 0:
+            page = 1
+            while True:
+                items = self._page_items(fetch_page(page, limit))
+                yield from items
+                if len(items) < limit:
+                    return
+                page += 1
         
-        return response.json()
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        try:
+            pending = deque()
+            next_page = 1
+            while len(pending) <= prefetch:
+                pending.append(executor.submit(fetch_page, next_page, limit))
+                next_page += 1
+            
+            while pending:
+                items = self._page_items(pending.popleft().result())
+                if len(items) < limit:
+                    yield from items
+                    return
+                pending.append(executor.submit(fetch_page, next_page, limit))
+                next_page += 1
+                yield from items
+        finally:
+            # Drop queued pages if the caller stops early or the end was reached
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _page_items(page: Any) -> Any:
+        """Items of a page response, whether a raw dict or a Page model"""
+        if isinstance(page, Page):
+            return page
+        return page.get('data', [])
     
     # Product operations
     
-    def get_products(self, page: int = 1, limit: int = 20) -> Dict[str, Any]:
+    def get_products(self, page: int = 1, limit: int = 20) -> Union[Dict[str, Any], Page]:
         """
         Get a paginated list of products.
         
@@ -61,13 +311,36 @@ class ShopClient:
             
         Returns:
             Dict containing product data and pagination metadata
+            (a Page of Products when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/products"
         params = {'page': page, 'limit': limit}
-        response = requests.get(url, params=params, headers=self.headers)
-        return self._handle_response(response)
+        return self._as_page(self._cached_get('/api/shop/products', params=params), Product)
     
-    def get_product(self, product_id: int) -> Dict[str, Any]:
+    def iter_products(self, limit: int = 100, prefetch: int = 2) -> Iterator[Any]:
+        """
+        Iterate over every product, walking all pages.
+        
+        The next ``prefetch`` pages are fetched in the background while the caller
+        consumes the current one. Keep ``prefetch`` below the client's ``pool_size``
+        so prefetching requests do not wait for connections.
+        
+        Args:
+            limit: Number of items per page (max 100)
+            prefetch: Number of pages to fetch ahead (0 fetches sequentially)
+            
+        Yields:
+            Product dicts (or Products when models are enabled), in API order
+            
+        Raises:
+            ValueError: If ``limit`` is outside 1..100
+        """
+        return self._iter_pages(
+            lambda page, page_limit: self.get_products(page=page, limit=page_limit),
+            limit,
+            prefetch
+        )
+    
+    def get_product(self, product_id: int) -> Union[Dict[str, Any], Product]:
         """
         Get a single product by ID.
         
@@ -75,11 +348,9 @@ class ShopClient:
             product_id: The product ID
             
         Returns:
-            Dict containing product data
+            Dict containing product data (a Product when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/products/{product_id}"
-        response = requests.get(url, headers=self.headers)
-        return self._handle_response(response)
+        return self._as_model(self._cached_get(f'/api/shop/products/{product_id}'), Product)
     
     def create_product(
         self, 
@@ -88,7 +359,7 @@ class ShopClient:
         price: float, 
         sku: str, 
         stock_quantity: int
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], Product]:
         """
         Create a new product.
         
@@ -100,9 +371,8 @@ class ShopClient:
             stock_quantity: Initial stock quantity
             
         Returns:
-            Dict containing the created product data
+            Dict containing the created product data (a Product when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/products"
         data = {
             'name': name,
             'description': description,
@@ -110,16 +380,17 @@ class ShopClient:
             'sku': sku,
             'stock_quantity': stock_quantity
         }
-        response = requests.post(url, json=data, headers=self.headers)
-        return self._handle_response(response)
+        response = self._request('POST', '/api/shop/products', json=data)
+        return self._as_model(self._handle_response(response), Product)
     
     # Order operations
     
     def create_order(
         self, 
         items: List[Dict[str, Any]], 
-        user_id: Optional[int] = None
-    ) -> Dict[str, Any]:
+        user_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Union[Dict[str, Any], Order]:
         """
         Create a new order.
         
@@ -127,22 +398,27 @@ class ShopClient:
             items: List of order items, each containing product_id, quantity, 
                   unit_price, name, and sku
             user_id: Optional user ID for registered users
+            idempotency_key: Optional key sent as the Idempotency-Key header so a
+                  replayed submission can be recognized by the server
             
         Returns:
-            Dict containing the created order data
+            Dict containing the created order data (an Order when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/orders"
         data = {
             'items': items
         }
         
         if user_id is not None:
             data['user_id'] = user_id
+        
+        headers = self.headers
+        if idempotency_key is not None:
+            headers = dict(self.headers, **{'Idempotency-Key': idempotency_key})
             
-        response = requests.post(url, json=data, headers=self.headers)
-        return self._handle_response(response)
+        response = self._request('POST', '/api/shop/orders', json=data, headers=headers)
+        return self._as_model(self._handle_response(response), Order)
     
-    def get_order(self, order_id: int) -> Dict[str, Any]:
+    def get_order(self, order_id: int) -> Union[Dict[str, Any], Order]:
         """
         Get order details by ID.
         
@@ -150,13 +426,12 @@ class ShopClient:
             order_id: The order ID
             
         Returns:
-            Dict containing order data with items
+            Dict containing order data with items (an Order when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/orders/{order_id}"
-        response = requests.get(url, headers=self.headers)
-        return self._handle_response(response)
+        response = self._request('GET', f'/api/shop/orders/{order_id}')
+        return self._as_model(self._handle_response(response), Order)
     
-    def get_orders(self, page: int = 1, limit: int = 20) -> Dict[str, Any]:
+    def get_orders(self, page: int = 1, limit: int = 20) -> Union[Dict[str, Any], Page]:
         """
         Get a paginated list of orders.
         
@@ -166,46 +441,65 @@ class ShopClient:
             
         Returns:
             Dict containing order data and pagination metadata
+            (a Page of Orders when models are enabled)
         """
-        url = f"{self.base_url}/api/shop/orders"
         params = {'page': page, 'limit': limit}
-        response = requests.get(url, params=params, headers=self.headers)
-        return self._handle_response(response)
+        response = self._request('GET', '/api/shop/orders', params=params)
+        return self._as_page(self._handle_response(response), Order)
+    
+    def iter_orders(self, limit: int = 100, prefetch: int = 2) -> Iterator[Any]:
+        """
+        Iterate over every order, walking all pages.
+        
+        Args:
+            limit: Number of items per page (max 100)
+            prefetch: Number of pages to fetch ahead (0 fetches sequentially)
+            
+        Yields:
+            Order dicts (or Orders when models are enabled), in API order
+            
+        Raises:
+            ValueError: If ``limit`` is outside 1..100
+        """
+        return self._iter_pages(
+            lambda page, page_limit: self.get_orders(page=page, limit=page_limit),
+            limit,
+            prefetch
+        )
 
 
 # Example usage
 if __name__ == "__main__":
-    # Initialize client
-    client = ShopClient("http://localhost:8000")
-    
-    try:
-        # Create a product
-        product = client.create_product(
-            name="Test Product",
-            description="A test product",
-            price=19.99,
-            sku="TEST-123",
-            stock_quantity=100
-        )
-        print(f"Created product: {product['name']} (ID: {product['id']})")
-        
-        # Create an order
-        order = client.create_order(
-            items=[
-                {
-                    "product_id": product["id"],
-                    "quantity": 2,
-                    "unit_price": product["price"],
-                    "name": product["name"],
-                    "sku": product["sku"]
-                }
-            ]
-        )
-        print(f"Created order: {order['id']} (Total: {order['total_amount']})")
-        
-        # Get order details
-        order_details = client.get_order(order["id"])
-        print(f"Order has {len(order_details['items'])} items")
-        
-    except ValueError as e:
-        print(f"Error: {e}")
\ No newline at end of file
+    # Initialize client; the context manager releases pooled connections
+    with ShopClient("http://localhost:8000") as client:
+        try:
+            # Create a product
+            product = client.create_product(
+                name="Test Product",
+                description="A test product",
+                price=19.99,
+                sku="TEST-123",
+                stock_quantity=100
+            )
+            print(f"Created product: {product['name']} (ID: {product['id']})")
+            
+            # Create an order
+            order = client.create_order(
+                items=[
+                    {
+                        "product_id": product["id"],
+                        "quantity": 2,
+                        "unit_price": product["price"],
+                        "name": product["name"],
+                        "sku": product["sku"]
+                    }
+                ]
+            )
+            print(f"Created order: {order['id']} (Total: {order['total_amount']})")
+            
+            # Get order details
+            order_details = client.get_order(order["id"])
+            print(f"Order has {len(order_details['items'])} items")
+            
+        except ValueError as e:
+            print(f"Error: {e}")
\ No newline at end of file
@@ -0,0 +1,433 @@
+"""
+Load generator for the Tandemx Shop API.
+
+Drives ShopClient with a weighted mix of product browsing, product creation and
+order placement, either at a target request rate (open loop) or with a fixed
+number of workers (closed loop). Latency percentiles, error rates and
+throughput are reported per interval and for the whole run. In open-loop mode
+latency is measured from each request's scheduled send time, so time spent
+waiting behind a saturated server counts, and sends that find every worker
+busy are reported as dropped rather than fired late in a burst.
+
+Example:
+    python shop_loadgen.py --base-url http://localhost:8000 --rps 50 --duration 60 \\
+        --mix list=30,view=50,create=5,order=15
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+
+from shop_client import ShopClient
+
+DEFAULT_MIX = "list=30,view=50,create=5,order=15"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as ``list=30,view=50,create=5,order=15``.
+
+    Args:
+        spec: Comma-separated name=weight pairs
+
+    Returns:
+        Mapping of operation name to weight
+
+    Raises:
+        ValueError: If the spec names an unknown operation or has no positive weight
+    """
+    mix = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (expected one of: {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("Operation mix needs at least one positive weight")
+    return mix
+
+
+class Stats:
+    """Thread-safe latency and error recorder with per-interval snapshots"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._interval: Dict[str, List[float]] = {}
+        self._interval_errors: Dict[str, int] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.error_samples: List[str] = []
+        # Open-loop sends skipped because every slot was busy, and sends that
+        # started more than one send interval after their scheduled time
+        self.dropped = 0
+        self.late = 0
+        self._interval_dropped = 0
+        self._interval_late = 0
+
+    def record(self, operation: str, latency: float, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self._interval.setdefault(operation, []).append(latency)
+            self.latencies.setdefault(operation, []).append(latency)
+            if error is not None:
+                self._interval_errors[operation] = self._interval_errors.get(operation, 0) + 1
+                self.errors[operation] = self.errors.get(operation, 0) + 1
+                if len(self.error_samples) < 10:
+                    self.error_samples.append(f"{operation}: {error}")
+
+    def record_dropped(self) -> None:
+        with self._lock:
+            self.dropped += 1
+            self._interval_dropped += 1
+
+    def record_late(self) -> None:
+        with self._lock:
+            self.late += 1
+            self._interval_late += 1
+
+    def take_interval(self):
+        with self._lock:
+            interval, errors = self._interval, self._interval_errors
+            dropped, late = self._interval_dropped, self._interval_late
+            self._interval, self._interval_errors = {}, {}
+            self._interval_dropped = self._interval_late = 0
+        return interval, errors, dropped, late
+
+
+def summarize(
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+    elapsed: float,
+    dropped: int = 0,
+    late: int = 0
+) -> Dict[str, Any]:
+    """
+    Build a report from recorded latencies.
+
+    Args:
+        latencies: Latencies in seconds per operation
+        errors: Error count per operation
+        elapsed: Wall-clock seconds covered by the samples
+        dropped: Open-loop sends skipped because every slot was busy
+        late: Open-loop sends that started more than one interval behind schedule
+
+    Returns:
+        Dict with overall and per-operation throughput, error rate and
+        percentiles, plus the dropped and late send counts
+    """
+    def describe(values: List[float], error_count: int) -> Dict[str, Any]:
+        ordered = sorted(values)
+        return {
+            'requests': len(ordered),
+            'errors': error_count,
+            'error_rate': error_count / len(ordered) if ordered else 0.0,
+            'throughput': len(ordered) / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': percentile(ordered, 50) * 1000,
+            'p95_ms': percentile(ordered, 95) * 1000,
+            'p99_ms': percentile(ordered, 99) * 1000,
+        }
+
+    all_values = [value for values in latencies.values() for value in values]
+    report = describe(all_values, sum(errors.values()))
+    report['elapsed'] = elapsed
+    report['dropped'] = dropped
+    report['late'] = late
+    report['operations'] = {
+        name: describe(values, errors.get(name, 0))
+        for name, values in sorted(latencies.items())
+    }
+    return report
+
+
+class LoadGenerator:
+    """Runs a weighted operation mix against the shop API"""
+
+    def __init__(
+        self,
+        client: ShopClient,
+        mix: Dict[str, float],
+        max_product_id: int = 100,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            client: ShopClient to drive (its pool size should cover the concurrency)
+            mix: Mapping of operation name to weight
+            max_product_id: Highest product ID used by view and order operations
+            seed: Optional random seed for a reproducible operation sequence
+        """
+        self.client = client
+        self.max_product_id = max_product_id
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.stats = Stats()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _choose(self) -> str:
+        with self._random_lock:
+            return self._random.choices(self.names, self.weights)[0]
+
+    def run_one(self, scheduled_at: Optional[float] = None) -> None:
+        """
+        Execute one randomly chosen operation and record its outcome.
+
+        Args:
+            scheduled_at: ``time.perf_counter()`` time the request was due to be
+                sent (open loop); latency is measured from it so queueing delay
+                is included. Defaults to now.
+        """
+        name = self._choose()
+        start = time.perf_counter() if scheduled_at is None else scheduled_at
+        error = None
+        try:
+            OPERATIONS[name](self)
+        except Exception as e:
+            error = e
+        self.stats.record(name, time.perf_counter() - start, error)
+
+    def run(
+        self,
+        duration: float,
+        rps: Optional[float] = None,
+        concurrency: int = 10,
+        report_every: float = 5.0,
+        on_report: Optional[Callable[[float, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate load for a fixed duration.
+
+        Args:
+            duration: Seconds to run
+            rps: Target requests per second (open loop); if None, ``concurrency``
+                workers issue requests back to back (closed loop)
+            concurrency: Worker threads (in open-loop mode, the cap on requests in flight)
+            report_every: Seconds between interval reports
+            on_report: Callback receiving (elapsed, interval report)
+
+        Returns:
+            Report for the whole run (see ``summarize``)
+        """
+        start = time.monotonic()
+        deadline = start + duration
+        done = threading.Event()
+
+        def reporter() -> None:
+            last = start
+            while not done.wait(report_every):
+                now = time.monotonic()
+                latencies, errors, dropped, late = self.stats.take_interval()
+                if on_report is not None:
+                    on_report(now - start, summarize(latencies, errors, now - last, dropped, late))
+                last = now
+
+        report_thread = threading.Thread(target=reporter, daemon=True)
+        report_thread.start()
+
+        try:
+            if rps:
+                self._run_open_loop(deadline, rps, concurrency)
+            else:
+                self._run_closed_loop(deadline, concurrency)
+        finally:
+            done.set()
+            report_thread.join()
+
+        return summarize(
+            self.stats.latencies, self.stats.errors, time.monotonic() - start,
+            self.stats.dropped, self.stats.late
+        )
+
+    def _run_closed_loop(self, deadline: float, concurrency: int) -> None:
+        def worker() -> None:
+            while time.monotonic() < deadline:
+                self.run_one()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+
+    def _run_open_loop(self, deadline: float, rps: float, concurrency: int) -> None:
+        # Requests are scheduled on a fixed timeline so slow responses do not
+        # lower the offered load. The schedule never waits for a slot: a send
+        # that finds all ``concurrency`` slots busy is dropped and counted, and
+        # latency runs from the scheduled time, so a saturated server shows up
+        # in the percentiles instead of being hidden by a delayed catch-up burst
+        slots = threading.BoundedSemaphore(concurrency)
+        interval = 1.0 / rps
+
+        def task(scheduled_at: float) -> None:
+            try:
+                if time.perf_counter() - scheduled_at > interval:
+                    self.stats.record_late()
+                self.run_one(scheduled_at)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # The deadline is on the monotonic clock; the schedule uses
+            # perf_counter, which run_one measures with
+            end = time.perf_counter() + (deadline - time.monotonic())
+            next_at = time.perf_counter()
+            while next_at < end:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if slots.acquire(blocking=False):
+                    executor.submit(task, next_at)
+                else:
+                    self.stats.record_dropped()
+                next_at += interval
+
+    # Operations
+
+    def list_products(self) -> None:
+        """Browse a random product page"""
+        page = self._random_int(1, max(1, self.max_product_id // 20))
+        self.client.get_products(page=page, limit=20)
+
+    def view_product(self) -> None:
+        """Open a random product"""
+        self.client.get_product(self._random_int(1, self.max_product_id))
+
+    def create(self) -> None:
+        """Create a product with a unique SKU"""
+        sku = f"LOAD-{uuid.uuid4().hex[:12]}"
+        self.client.create_product(
+            name=f"Load Test {sku}",
+            description="Created by shop_loadgen",
+            price=round(self._random_float(1, 100), 2),
+            sku=sku,
+            stock_quantity=self._random_int(1, 500)
+        )
+
+    def order(self) -> None:
+        """Place an order for one to three random products"""
+        items = []
+        for _ in range(self._random_int(1, 3)):
+            product_id = self._random_int(1, self.max_product_id)
+            items.append({
+                'product_id': product_id,
+                'quantity': self._random_int(1, 3),
+                'unit_price': round(self._random_float(1, 100), 2),
+                'name': f"Product {product_id}",
+                'sku': f"SKU-{product_id}"
+            })
+        self.client.create_order(items)
+
+    def _random_int(self, low: int, high: int) -> int:
+        with self._random_lock:
+            return self._random.randint(low, high)
+
+    def _random_float(self, low: float, high: float) -> float:
+        with self._random_lock:
+            return self._random.uniform(low, high)
+
+
+OPERATIONS: Dict[str, Callable[[LoadGenerator], None]] = {
+    'list': LoadGenerator.list_products,
+    'view': LoadGenerator.view_product,
+    'create': LoadGenerator.create,
+    'order': LoadGenerator.order,
+}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    line = (
+        f"{report['requests']:>7} req  {report['throughput']:8.1f} req/s  "
+        f"err {report['error_rate'] * 100:5.1f}%  "
+        f"p50 {report['p50_ms']:7.1f} ms  p95 {report['p95_ms']:7.1f} ms  "
+        f"p99 {report['p99_ms']:7.1f} ms"
+    )
+    if report.get('dropped') or report.get('late'):
+        line += f"  dropped {report['dropped']}  late {report['late']}"
+    return line
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate mixed load against the Tandemx Shop API")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--api-key", default=None, help="Optional API key")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--rps", type=float, default=None,
+                        help="Target requests per second (default: closed loop at --concurrency)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Worker threads / max requests in flight")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--max-product-id", type=int, default=100, help="Highest product ID to view and order")
+    parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between interval reports")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print the final report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Retries would hide the server's real error rate
+    with ShopClient(
+        args.base_url,
+        api_key=args.api_key,
+        timeout=args.timeout,
+        pool_size=args.concurrency,
+        max_retries=0
+    ) as client:
+        generator = LoadGenerator(client, mix, args.max_product_id, args.seed)
+
+        mode = f"{args.rps:g} req/s" if args.rps else f"{args.concurrency} workers"
+        print(f"Running {args.mix} against {args.base_url} for {args.duration:g}s at {mode}",
+              file=sys.stderr)
+
+        def on_report(elapsed: float, report: Dict[str, Any]) -> None:
+            print(f"[{elapsed:6.1f}s] {format_report(report)}", file=sys.stderr)
+
+        report = generator.run(
+            args.duration,
+            rps=args.rps,
+            concurrency=args.concurrency,
+            report_every=args.report_every,
+            on_report=on_report
+        )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Total     {format_report(report)}")
+        for name, op_report in report['operations'].items():
+            print(f"{name:<9} {format_report(op_report)}")
+        for sample in generator.stats.error_samples:
+            print(f"  error: {sample}")
+
+    return 1 if report['requests'] and report['error_rate'] == 1.0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
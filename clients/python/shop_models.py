@@ -0,0 +1,159 @@
+import json
+from typing import Callable, Dict, List, Any, Iterator, Optional, Type, Union
+
+try:
+    import orjson
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON with orjson"""
+        return orjson.loads(data)
+except ImportError:
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON with the standard library (install orjson for speed)"""
+        return json.loads(data)
+
+
+class Model:
+    """
+    Base class for slotted shop API response models.
+
+    Subclasses list their fields in ``__slots__``; fields missing from the
+    response are set to None and unknown keys are ignored.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields: Any):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Model':
+        """Build a model from a decoded JSON object"""
+        instance = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(instance, name, data.get(name))
+        return instance
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to a plain dict"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Product(Model):
+    """A shop product"""
+
+    __slots__ = (
+        'id', 'name', 'description', 'price', 'sku', 'stock_quantity',
+        'status', 'created_at', 'updated_at'
+    )
+
+
+class OrderItem(Model):
+    """A line of an order"""
+
+    __slots__ = ('id', 'product_id', 'quantity', 'price', 'product_name', 'sku')
+
+
+class Order(Model):
+    """An order with its items"""
+
+    __slots__ = ('id', 'user_id', 'status', 'total_amount', 'created_at', 'updated_at', 'items')
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Order':
+        order = super().from_dict(data)
+        order.items = [OrderItem.from_dict(item) for item in (data.get('items') or [])]
+        return order
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = super().to_dict()
+        result['items'] = [item.to_dict() for item in self.items]
+        return result
+
+
+class Page:
+    """
+    One page of a list endpoint.
+
+    In lazy mode each decoded JSON row is turned into a model the first time
+    it is accessed, and the row is dropped once its model exists, so code that
+    only looks at a few rows skips building the rest. This saves
+    model-construction time, not memory: until they are accessed, rows are
+    held as the dicts the JSON parser produced.
+    """
+
+    __slots__ = ('page', 'page_size', 'total_count', '_items', '_decode')
+
+    def __init__(
+        self,
+        rows: List[Dict[str, Any]],
+        model: Type[Model],
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        total_count: Optional[int] = None,
+        lazy: bool = True
+    ):
+        """
+        Initialize the page.
+
+        Args:
+            rows: Decoded JSON objects from the ``data`` list
+            model: Model class for the rows
+            page: Page number from the response metadata
+            page_size: Page size from the response metadata
+            total_count: Item count from the response metadata
+            lazy: Build models on access instead of up front
+        """
+        self.page = page
+        self.page_size = page_size
+        self.total_count = total_count
+        self._decode: Callable[[Dict[str, Any]], Model] = model.from_dict
+        # Each slot holds the decoded row until its model is built, then the model
+        self._items: List[Any] = list(rows) if lazy else [self._decode(row) for row in rows]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], model: Type[Model], lazy: bool = True) -> 'Page':
+        """Build a page from a decoded ``{"data": [...], "meta": {...}}`` response"""
+        meta = data.get('meta') or {}
+        return cls(
+            data.get('data') or [],
+            model,
+            page=meta.get('page'),
+            page_size=meta.get('page_size'),
+            total_count=meta.get('total_count'),
+            lazy=lazy
+        )
+
+    @property
+    def raw(self) -> List[Dict[str, Any]]:
+        """The rows as dicts (rebuilt with ``to_dict()`` for rows already decoded)"""
+        return [item if isinstance(item, dict) else item.to_dict() for item in self._items]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Model, List[Model]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if isinstance(item, dict):
+            item = self._decode(item)
+            self._items[index] = item
+        return item
+
+    def __iter__(self) -> Iterator[Model]:
+        for index in range(len(self._items)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"Page(page={self.page!r}, page_size={self.page_size!r}, items={len(self)})"
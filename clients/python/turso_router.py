@@ -0,0 +1,323 @@
+import time
+import threading
+import httpx
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from direct_turso_client import TursoClient
+
+
+class _PoolEntry:
+    """A pooled per-tenant client with usage bookkeeping"""
+
+    def __init__(self, client: TursoClient, http_client: Optional[httpx.Client]):
+        self.client = client
+        self.http_client = http_client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        # Set when the tenant is re-registered; closed once no longer in use
+        self.stale = False
+        # Local SQLite connections are not safe for concurrent use
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        self.client.close()
+        if self.http_client is not None:
+            self.http_client.close()
+
+
+class TursoRouter:
+    """
+    Routes queries to one Turso database per tenant (e.g. one per store).
+
+    Tenants are mapped to a database URL and auth token, either up front via
+    ``register_tenant`` or lazily through a resolver callable. Clients are kept
+    in a bounded LRU pool; each remote tenant gets its own keep-alive HTTP
+    connection pool, and entries idle for longer than ``idle_timeout`` are
+    closed. ``fan_out`` runs a query against many shards concurrently.
+    """
+
+    def __init__(
+        self,
+        tenants: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+        resolver: Optional[Callable[[str], Tuple[str, Optional[str]]]] = None,
+        max_clients: int = 32,
+        idle_timeout: float = 300.0,
+        max_workers: int = 16,
+        max_connections_per_tenant: int = 4
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            tenants: Mapping of tenant key to (database_url, auth_token)
+            resolver: Optional callable returning (database_url, auth_token) for
+                tenant keys not present in ``tenants``
+            max_clients: Maximum number of pooled tenant clients
+            idle_timeout: Seconds after which an unused tenant client is evicted
+            max_workers: Maximum number of shards queried concurrently by fan_out
+            max_connections_per_tenant: HTTP connection pool size per remote tenant
+        """
+        self.tenants: Dict[str, Tuple[str, Optional[str]]] = dict(tenants or {})
+        self.resolver = resolver
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.max_workers = max_workers
+        self.max_connections_per_tenant = max_connections_per_tenant
+        self._pool: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._pool_lock = threading.Lock()
+
+    def __enter__(self) -> "TursoRouter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def register_tenant(
+        self,
+        tenant: str,
+        database_url: str,
+        auth_token: Optional[str] = None
+    ) -> None:
+        """
+        Map a tenant key to a database.
+
+        Re-registering a tenant drops any pooled client for its old database;
+        a client still in use is closed when its last caller releases it.
+
+        Args:
+            tenant: Tenant key (e.g. store ID)
+            database_url: Turso database URL or ``file:`` path
+            auth_token: Turso authentication token
+        """
+        with self._pool_lock:
+            self.tenants[tenant] = (database_url, auth_token)
+            entry = self._pool.pop(tenant, None)
+            if entry is not None:
+                entry.stale = True
+                if entry.in_use == 0:
+                    entry.close()
+
+    def _resolve(self, tenant: str) -> Tuple[str, Optional[str]]:
+        """Look up an unregistered tenant through the resolver (pool lock not held)"""
+        if self.resolver is None:
+            raise KeyError(f"Unknown tenant: {tenant}")
+        return self.resolver(tenant)
+
+    def _create_entry(self, target: Tuple[str, Optional[str]]) -> _PoolEntry:
+        database_url, auth_token = target
+        http_client = None
+        if not database_url.startswith("file:"):
+            limits = httpx.Limits(
+                max_connections=self.max_connections_per_tenant,
+                max_keepalive_connections=self.max_connections_per_tenant,
+                keepalive_expiry=self.idle_timeout
+            )
+            http_client = httpx.Client(limits=limits, timeout=30.0)
+        # Tenants are fully described by their registration; falling back to the
+        # TURSO_* environment would point them all at the central database
+        if database_url.startswith("file:"):
+            client = TursoClient(
+                database_url=database_url,
+                local_path=database_url[len("file:"):],
+                use_env=False
+            )
+        else:
+            client = TursoClient(
+                database_url=database_url,
+                auth_token=auth_token,
+                http_client=http_client,
+                use_env=False
+            )
+        return _PoolEntry(client, http_client)
+
+    def _evict(self, now: float) -> None:
+        """Close idle entries, then least recently used ones above the bound (pool lock held)"""
+        for tenant in list(self._pool):
+            entry = self._pool[tenant]
+            if entry.in_use == 0 and now - entry.last_used > self.idle_timeout:
+                del self._pool[tenant]
+                entry.close()
+
+        # Entries are kept in LRU order; in-use entries are skipped, so the pool
+        # may briefly exceed the bound while every client is busy
+        for tenant in list(self._pool):
+            if len(self._pool) <= self.max_clients:
+                break
+            entry = self._pool[tenant]
+            if entry.in_use == 0:
+                del self._pool[tenant]
+                entry.close()
+
+    def _acquire(self, tenant: str) -> _PoolEntry:
+        while True:
+            with self._pool_lock:
+                entry = self._pool.get(tenant)
+                if entry is not None:
+                    self._pool.move_to_end(tenant)
+                    entry.in_use += 1
+                    self._evict(time.monotonic())
+                    return entry
+                target = self.tenants.get(tenant)
+
+            # Resolving and connecting can be slow, so they run without the pool
+            # lock and queries to other tenants carry on meanwhile
+            if target is None:
+                target = self._resolve(tenant)
+            created = self._create_entry(target)
+
+            with self._pool_lock:
+                if self._pool.get(tenant) is None and self.tenants.setdefault(tenant, target) == target:
+                    self._pool[tenant] = created
+                    created.in_use += 1
+                    self._evict(time.monotonic())
+                    return created
+            # Another caller pooled the tenant first, or it was re-registered
+            # meanwhile; use the pooled entry or the new registration instead
+            created.close()
+
+    def _release(self, entry: _PoolEntry) -> None:
+        with self._pool_lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            if entry.stale and entry.in_use == 0:
+                entry.close()
+
+    def evict_idle(self) -> int:
+        """
+        Close tenant clients that have been idle longer than ``idle_timeout``.
+
+        Returns:
+            Number of clients still pooled
+        """
+        with self._pool_lock:
+            self._evict(time.monotonic())
+            return len(self._pool)
+
+    def close(self) -> None:
+        """Close every pooled tenant client"""
+        with self._pool_lock:
+            for entry in self._pool.values():
+                entry.close()
+            self._pool.clear()
+
+    def execute(self, tenant: str, query: str, params: List[Any] = None) -> Dict[str, Any]:
+        """
+        Execute a SQL query against a single tenant's database.
+
+        Args:
+            tenant: Tenant key
+            query: SQL query string
+            params: List of parameters for the query
+
+        Returns:
+            Dictionary with query results
+        """
+        entry = self._acquire(tenant)
+        try:
+            with entry.lock:
+                return entry.client.execute(query, params)
+        finally:
+            self._release(entry)
+
+    def fan_out(
+        self,
+        query: str,
+        params: List[Any] = None,
+        tenants: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute a query against many tenants concurrently.
+
+        Args:
+            query: SQL query string
+            params: List of parameters for the query
+            tenants: Tenant keys to query (defaults to all registered tenants)
+
+        Returns:
+            Mapping of tenant key to query results
+
+        Raises:
+            Exception: If the query failed on any tenant, after all have finished
+        """
+        if tenants is None:
+            tenants = list(self.tenants)
+        if not tenants:
+            return {}
+
+        # Never run more shards at once than the pool can hold
+        workers = max(1, min(self.max_workers, self.max_clients, len(tenants)))
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, Exception] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.execute, tenant, query, params): tenant
+                for tenant in tenants
+            }
+            for future, tenant in futures.items():
+                try:
+                    results[tenant] = future.result()
+                except Exception as e:
+                    errors[tenant] = e
+
+        if errors:
+            details = "; ".join(f"{tenant}: {error}" for tenant, error in errors.items())
+            raise Exception(f"Fan-out failed for {len(errors)} tenant(s): {details}")
+
+        return results
+
+    def fan_out_rows(
+        self,
+        query: str,
+        params: List[Any] = None,
+        tenants: Optional[List[str]] = None,
+        tenant_column: str = "tenant"
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT against many tenants and merge the rows.
+
+        Args:
+            query: SQL query string
+            params: List of parameters for the query
+            tenants: Tenant keys to query (defaults to all registered tenants)
+            tenant_column: Key added to each row naming the tenant it came from
+
+        Returns:
+            Rows from every tenant, in tenant order
+        """
+        results = self.fan_out(query, params, tenants)
+        rows = []
+        for tenant, result in results.items():
+            for row in result.get("results", {}).get("rows", []):
+                merged = dict(row)
+                merged[tenant_column] = tenant
+                rows.append(merged)
+        return rows
+
+
+# Example usage
+if __name__ == "__main__":
+    router = TursoRouter(tenants={
+        "store-1": ("file:store1.db", None),
+        "store-2": ("file:store2.db", None),
+    })
+
+    with router:
+        for store in ("store-1", "store-2"):
+            router.execute(store, """
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    stock_quantity INTEGER DEFAULT 0
+                )
+            """)
+            router.execute(
+                store,
+                "INSERT INTO products (name, stock_quantity) VALUES (?, ?)",
+                [f"Product from {store}", 5]
+            )
+
+        rows = router.fan_out_rows("SELECT name, stock_quantity FROM products")
+        print(f"Fetched {len(rows)} products across {len(router.tenants)} stores")
@@ -4,12 +4,16 @@ import random
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QLineEdit, QPushButton,
                             QComboBox, QGridLayout, QGroupBox, QStatusBar,
-                            QMessageBox, QFileDialog, QCheckBox)
+                            QMessageBox, QFileDialog, QCheckBox, QInputDialog)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 import pandas as pd
 
 # Import with absolute imports
-from utils.inventory import (load_inventory, search_by_barcode)
+from utils.inventory import (load_inventory, search_by_barcode, search_by_barcodes)
+from utils.inventory_index import InventoryIndex
+from utils.inventory_cache import load_inventory_cached
+from utils.inventory_watch import InventoryWatcher
+from utils.inventory_shared import SharedInventory
 from utils.labelgen import (generate_label, get_available_templates,
                           save_to_file, save_to_pdf, log_print_history)
 from utils.printer import (print_text, print_label, get_system_printers, 
@@ -17,6 +21,7 @@ from utils.printer import (print_text, print_label, get_system_printers,
 
 class BarcodeScanWidget(QWidget):
     scan_detected = pyqtSignal(str)
+    bulk_scan_detected = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -48,9 +53,14 @@ class BarcodeScanWidget(QWidget):
         self.search_btn = QPushButton("Search")
         self.search_btn.clicked.connect(self.on_return_pressed)
 
+        self.bulk_btn = QPushButton("Bulk Scan...")
+        self.bulk_btn.clicked.connect(self.on_bulk_scan)
+        self.bulk_btn.setToolTip("Paste or scan many barcodes at once (e.g. a whole pallet)")
+
         scan_layout.addWidget(self.scan_label)
         scan_layout.addWidget(self.scan_input, 1)  # 1 = stretch factor
         scan_layout.addWidget(self.search_btn)
+        scan_layout.addWidget(self.bulk_btn)
         
         # Demo row with sample barcodes
         demo_layout = QHBoxLayout()
@@ -101,6 +111,16 @@ class BarcodeScanWidget(QWidget):
         if barcode:
             self.scan_detected.emit(barcode)
             
+    def on_bulk_scan(self):
+        """Collect a batch of barcodes, one per line or separated by commas"""
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Bulk Scan", "Paste or scan barcodes (one per line):"
+        )
+        if ok:
+            barcodes = text.replace(',', '\n').split()
+            if barcodes:
+                self.bulk_scan_detected.emit(barcodes)
+            
     def demo_scan(self, barcode):
         """Simulate scanning a specific barcode"""
         self.scan_input.setText(barcode)
@@ -116,10 +136,15 @@ class BarcodeScanWidget(QWidget):
 
 class InventoryResultWidget(QWidget):
     generate_label_requested = pyqtSignal(dict)
+    # Emitted when the user steps to another item of a bulk scan
+    batch_item_selected = pyqtSignal(dict)
+    print_all_requested = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.item_data = None
+        self.batch_items = []
+        self.batch_position = 0
         self.init_ui()
 
     def init_ui(self):
@@ -188,9 +213,28 @@ class InventoryResultWidget(QWidget):
         self.generate_btn.clicked.connect(self.on_generate_clicked)
         self.generate_btn.setEnabled(False)
 
+        # Bulk scan navigation, shown while a batch is loaded
+        self.batch_group = QGroupBox("Bulk Scan")
+        batch_layout = QHBoxLayout()
+        self.prev_btn = QPushButton("< Prev")
+        self.prev_btn.clicked.connect(lambda: self.show_batch_item(self.batch_position - 1))
+        self.batch_label = QLabel("")
+        self.batch_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.next_btn = QPushButton("Next >")
+        self.next_btn.clicked.connect(lambda: self.show_batch_item(self.batch_position + 1))
+        self.print_all_btn = QPushButton("Print All Labels")
+        self.print_all_btn.clicked.connect(lambda: self.print_all_requested.emit(list(self.batch_items)))
+        batch_layout.addWidget(self.prev_btn)
+        batch_layout.addWidget(self.batch_label, 1)
+        batch_layout.addWidget(self.next_btn)
+        batch_layout.addWidget(self.print_all_btn)
+        self.batch_group.setLayout(batch_layout)
+        self.batch_group.setVisible(False)
+
         # Add to main layout
         layout.addWidget(self.info_group, 0, 0, 1, 2)
-        layout.addWidget(self.generate_btn, 1, 0, 1, 2)
+        layout.addWidget(self.batch_group, 1, 0, 1, 2)
+        layout.addWidget(self.generate_btn, 2, 0, 1, 2)
 
         self.setLayout(layout)
 
@@ -216,6 +260,30 @@ class InventoryResultWidget(QWidget):
         else:
             self.clear()
 
+    def set_batch(self, items):
+        """Show the items found by a bulk scan, starting with the first"""
+        self.batch_items = list(items)
+        if not self.batch_items:
+            self.clear()
+            return
+        self.batch_group.setVisible(True)
+        self.show_batch_item(0)
+
+    def show_batch_item(self, position):
+        if not 0 <= position < len(self.batch_items):
+            return
+        self.batch_position = position
+        self.set_item(self.batch_items[position])
+        self.batch_label.setText(f"Item {position + 1} of {len(self.batch_items)}")
+        self.prev_btn.setEnabled(position > 0)
+        self.next_btn.setEnabled(position + 1 < len(self.batch_items))
+        self.batch_item_selected.emit(self.batch_items[position])
+
+    def clear_batch(self):
+        self.batch_items = []
+        self.batch_position = 0
+        self.batch_group.setVisible(False)
+
     def clear(self):
         self.item_data = None
         self.product_name_value.setText("")
@@ -509,12 +577,25 @@ class LabelPreviewWidget(QWidget):
 
 
 class MainWindow(QMainWindow):
+    # Carries reloaded inventory from the watcher thread to the GUI thread
+    inventory_reloaded = pyqtSignal(object, object, object)
+    inventory_reload_failed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
-        self.inventory_df = None
+        # (DataFrame, InventoryIndex), always replaced together in one
+        # assignment so the watcher thread never sees a mismatched pair
+        self.inventory = (None, None)
+        self.inventory_watcher = None
+        self.shared_inventory = None
+        self.shared_timer = None
         self.current_item = None
         self.demo_inventory = None  # For demo/fallback data
         self.demo_mode = os.environ.get("SCANPRINT_DEMO_MODE", "0") == "1"
+        # Smaller column types for large exports on low-memory stations
+        self.compact_inventory = os.environ.get("SCANPRINT_COMPACT", "0") == "1"
+        # Map the inventory published by utils.inventory_shared instead of loading the CSV
+        self.shared_dir = os.environ.get("SCANPRINT_SHARED_DIR")
         self.init_ui()
         self.load_inventory_data()
         self.create_demo_inventory()  # Create demo data as fallback
@@ -560,8 +641,15 @@ class MainWindow(QMainWindow):
 
         # Connect signals
         self.scan_widget.scan_detected.connect(self.on_barcode_scan)
+        self.scan_widget.bulk_scan_detected.connect(self.on_bulk_scan)
         self.result_widget.generate_label_requested.connect(self.on_generate_label)
+        self.result_widget.batch_item_selected.connect(self.on_batch_item_selected)
+        self.result_widget.print_all_requested.connect(self.on_print_all_labels)
         self.preview_widget.print_requested.connect(self.on_print_label)
+        self.inventory_reloaded.connect(self.on_inventory_reloaded)
+        self.inventory_reload_failed.connect(
+            lambda error: self.status_bar.showMessage(f"Error reloading inventory: {error}")
+        )
 
         # Set initial focus to the scan input
         self.scan_widget.set_focus()
@@ -573,10 +661,17 @@ class MainWindow(QMainWindow):
             "inventory", "marktpos_export.csv"
         )
 
+        if self.shared_dir:
+            self.load_shared_inventory()
+            return
+
         try:
-            self.inventory_df = load_inventory(inventory_path)
+            # Reuses the parsed data and index while the export is unchanged
+            self.inventory = load_inventory_cached(inventory_path, compact=self.compact_inventory)
             count = len(self.inventory_df)
             self.status_bar.showMessage(f"Loaded {count} inventory items.")
+            self.report_duplicate_keys()
+            self.start_inventory_watcher(inventory_path)
         except FileNotFoundError:
             self.status_bar.showMessage("Inventory file not found. Using demo data.")
             QMessageBox.warning(
@@ -592,6 +687,83 @@ class MainWindow(QMainWindow):
             )
             # We'll use demo inventory instead
             
+    def load_shared_inventory(self):
+        """Map the inventory another process publishes for all stations on this host"""
+        try:
+            self.shared_inventory = SharedInventory(self.shared_dir)
+            version, inventory_df = self.shared_inventory.load()
+        except (FileNotFoundError, ImportError, ValueError) as e:
+            self.shared_inventory = None
+            self.status_bar.showMessage(f"Shared inventory unavailable: {e}. Using demo data.")
+            return
+
+        # The lookup index lives in per-process memory, so shared stations
+        # search the mapped columns directly to keep their footprint flat
+        self.inventory = (inventory_df, None)
+        self.status_bar.showMessage(f"Mapped {len(self.inventory_df)} shared inventory items (version {version}).")
+
+        self.shared_timer = QTimer(self)
+        self.shared_timer.timeout.connect(self.refresh_shared_inventory)
+        self.shared_timer.start(2000)
+
+    def refresh_shared_inventory(self):
+        """Switch to a newly published shared inventory; runs on the GUI thread between scans"""
+        try:
+            inventory_df = self.shared_inventory.refresh()
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"Error reloading shared inventory: {e}")
+            return
+        if inventory_df is not None:
+            self.inventory = (inventory_df, None)
+            self.status_bar.showMessage(
+                f"Shared inventory updated to version {self.shared_inventory.version} "
+                f"({len(inventory_df)} items)."
+            )
+
+    def start_inventory_watcher(self, inventory_path):
+        """Pick up new exports of the inventory file without a restart"""
+        self.inventory_watcher = InventoryWatcher(
+            inventory_path,
+            get_current=lambda: self.inventory,
+            on_reload=self.inventory_reloaded.emit,
+            on_error=lambda e: self.inventory_reload_failed.emit(str(e)),
+            load_options={'compact': self.compact_inventory}
+        )
+        self.inventory_watcher.start()
+
+    def on_inventory_reloaded(self, inventory_df, inventory_index, diff):
+        """Swap in reloaded inventory; runs on the GUI thread between scans"""
+        self.inventory = (inventory_df, inventory_index)
+        if diff is None:
+            self.status_bar.showMessage(f"Reloaded {len(inventory_df)} inventory items.")
+            self.report_duplicate_keys()
+        elif diff:
+            self.status_bar.showMessage(f"Inventory updated: {diff.summary()}.")
+
+    @property
+    def inventory_df(self):
+        return self.inventory[0]
+
+    @property
+    def inventory_index(self):
+        return self.inventory[1]
+
+    def closeEvent(self, event):
+        if self.inventory_watcher is not None:
+            self.inventory_watcher.stop()
+        if self.shared_timer is not None:
+            self.shared_timer.stop()
+        super().closeEvent(event)
+
+    def report_duplicate_keys(self):
+        """Log barcodes and SKUs that appear on more than one inventory row"""
+        duplicates = self.inventory_index.duplicates()
+        for key_type, keys in duplicates.items():
+            if keys:
+                sample = ", ".join(list(keys)[:5])
+                print(f"WARNING: {len(keys)} duplicate {key_type} value(s) in inventory "
+                      f"(first match is used): {sample}")
+
     def create_demo_inventory(self):
         """Create demo inventory data for testing without a real inventory file"""
         # Create a demo DataFrame with sample products
@@ -642,7 +814,7 @@ class MainWindow(QMainWindow):
         
         # If no real inventory was loaded, use the demo inventory
         if self.inventory_df is None:
-            self.inventory_df = self.demo_inventory
+            self.inventory = (self.demo_inventory, InventoryIndex(self.demo_inventory))
             count = len(self.inventory_df)
             self.status_bar.showMessage(f"Using demo inventory with {count} items.")
 
@@ -653,11 +825,12 @@ class MainWindow(QMainWindow):
 
         # Clear previous results
         self.current_item = None
+        self.result_widget.clear_batch()
         self.result_widget.clear()
         self.preview_widget.clear()
 
-        # Search for item by barcode
-        self.current_item = search_by_barcode(self.inventory_df, barcode)
+        # Search for item by barcode (constant time via the index)
+        self.current_item = search_by_barcode(self.inventory_df, barcode, self.inventory_index)
 
         if self.current_item:
             self.status_bar.showMessage(f"Item found: {self.current_item.get('product_name', '')}")
@@ -675,6 +848,59 @@ class MainWindow(QMainWindow):
                     f"No item found with barcode: {barcode}"
                 )
                 
+    def on_bulk_scan(self, barcodes):
+        if self.inventory_df is None:
+            self.status_bar.showMessage("No inventory data loaded.")
+            return
+
+        # Resolve the whole batch in one pass
+        items, not_found = search_by_barcodes(self.inventory_df, barcodes, self.inventory_index)
+
+        # Keep the whole batch; the result panel steps through it and can
+        # print a label for every item
+        self.current_item = None
+        self.preview_widget.clear()
+        self.result_widget.clear_batch()
+        self.result_widget.set_batch(items)
+
+        self.status_bar.showMessage(
+            f"Bulk scan: {len(items)} of {len(items) + len(not_found)} barcodes found."
+        )
+        if not_found:
+            shown = "\n".join(not_found[:20])
+            more = f"\n... and {len(not_found) - 20} more" if len(not_found) > 20 else ""
+            QMessageBox.information(
+                self, "Not Found",
+                f"{len(not_found)} barcode(s) not found:\n{shown}{more}"
+            )
+
+    def on_batch_item_selected(self, item_data):
+        self.current_item = item_data
+        self.preview_widget.clear()
+
+    def on_print_all_labels(self, items):
+        """Print one label per item of a bulk scan with the selected template"""
+        template_name = self.preview_widget.template_selector.currentText()
+        printed = 0
+        for item in items:
+            success, message = self.print_item_label(item, template_name)
+            if not success:
+                self.status_bar.showMessage(f"Stopped after {printed} of {len(items)} labels: {message}")
+                return
+            printed += 1
+        self.status_bar.showMessage(f"Printed {printed} labels using template: {template_name}")
+
+    def print_item_label(self, item_data, template_name):
+        """Generate, preview, log and print (or simulate printing) one label; returns (success, message)"""
+        label_text = generate_label(item_data, template_name)
+        self.preview_widget.set_content(label_text)
+        log_print_history(item_data, template_name)
+
+        printer_name = self.preview_widget.printer_selector.currentText()
+        if self.preview_widget.demo_mode:
+            return True, f"[DEMO] Label simulated printing to {printer_name} using template: {template_name}"
+        return print_label(label_text, printer_name)
+
     def generate_demo_item(self, barcode):
         """Generate a demo item for barcodes not found in inventory"""
         # Create a random demo product
@@ -718,27 +944,15 @@ class MainWindow(QMainWindow):
         if not self.current_item:
             return
 
-        # Regenerate the label with the selected template
-        label_text = generate_label(self.current_item, template_name)
+        success, message = self.print_item_label(self.current_item, template_name)
 
-        # Update the preview
-        self.preview_widget.set_content(label_text)
-
-        # Log the print history
-        log_print_history(self.current_item, template_name)
-
-        # Get the selected printer
         printer_name = self.preview_widget.printer_selector.currentText()
-
         if self.preview_widget.demo_mode:
-            self.status_bar.showMessage(f"[DEMO] Label simulated printing to {printer_name} using template: {template_name}")
+            self.status_bar.showMessage(message)
+        elif success:
+            self.status_bar.showMessage(f"Label printed to {printer_name}: {message}")
         else:
-            # Use the printer module to actually print the label
-            success, message = print_label(label_text, printer_name)
-            if success:
-                self.status_bar.showMessage(f"Label printed to {printer_name}: {message}")
-            else:
-                self.status_bar.showMessage(f"Error printing to {printer_name}: {message}")
+            self.status_bar.showMessage(f"Error printing to {printer_name}: {message}")
 
 
 def main():
@@ -0,0 +1,47 @@
+"""Inventory builders and checks shared by the tests."""
+
+import numpy as np
+import pandas as pd
+
+from utils.inventory import normalize_inventory
+from utils.inventory_index import InventoryIndex
+
+
+def make_inventory(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Small export with repeated quantities, departments and a duplicate barcode"""
+    rng = np.random.default_rng(seed)
+    barcodes = [f"0{i:011d}" for i in range(rows)]
+    barcodes[-1] = barcodes[0]
+    df = pd.DataFrame({
+        "Product Name": [f"Product {i}" for i in range(rows)],
+        "SKU": [f"SKU-{i:05d}" for i in range(rows)],
+        "Barcode": barcodes,
+        "Department": rng.choice(["Grocery", "Hardware", "Toys", None], rows),
+        "Price": rng.integers(100, 5000, rows) / 100,
+        "Cost": rng.integers(50, 2500, rows) / 100,
+        "Quantity": rng.integers(0, 8, rows),
+        "Description": [f"Description {i}" for i in range(rows)],
+        "Supplier": rng.choice(["Acme", "Globex", None], rows),
+    })
+    return normalize_inventory(df)
+
+
+def assert_index_matches(index: InventoryIndex, inventory_df: pd.DataFrame) -> None:
+    """Compare every lookup structure with a fresh index over the same rows"""
+    expected = InventoryIndex(inventory_df).get_state()
+    actual = index.get_state()
+
+    for name in ('barcode_positions', 'duplicate_barcodes', 'sku_positions', 'duplicate_skus'):
+        assert actual[name] == expected[name], name
+    for column, groups in expected['groups'].items():
+        assert actual['groups'][column].keys() == groups.keys(), column
+        for key, positions in groups.items():
+            np.testing.assert_array_equal(actual['groups'][column][key], positions)
+        np.testing.assert_array_equal(actual['group_codes'][column], expected['group_codes'][column])
+    for name in ('quantity_order', 'sorted_quantities', 'margins', 'price_order',
+                 'sorted_prices', 'margin_order', 'sorted_margins'):
+        np.testing.assert_array_equal(actual[name], expected[name], err_msg=name)
+    # Running totals accumulate rounding error, so compare them approximately
+    assert actual['value_totals'].keys() == expected['value_totals'].keys()
+    for name, totals in expected['value_totals'].items():
+        np.testing.assert_allclose(actual['value_totals'][name], totals, err_msg=name)
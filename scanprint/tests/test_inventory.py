@@ -0,0 +1,51 @@
+"""Filters over compact inventories must agree with the full-size frame."""
+
+import pytest
+
+from utils.inventory import (
+    calculate_inventory_value, compact_inventory, filter_by_margin, filter_by_price_range, search_by_sku
+)
+from utils.inventory_index import InventoryIndex
+
+from inventory_helpers import make_inventory
+
+
+@pytest.fixture
+def inventory_df():
+    df = make_inventory(50)
+    # Neither is exact in float32
+    df.loc[[3, 9], 'price'] = 19.99
+    df.loc[[3, 9], 'cost'] = [9.99, 11.99]
+    return df
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_compact_price_bounds_are_inclusive(inventory_df, use_index):
+    compact_df = compact_inventory(inventory_df)
+    for df in (inventory_df, compact_df):
+        index = InventoryIndex(df) if use_index else None
+        assert sorted(filter_by_price_range(df, low=19.99, high=19.99, index=index)['sku']) == ['SKU-00003', 'SKU-00009']
+        assert len(filter_by_price_range(df, low=19.99, index=index)) == len(
+            filter_by_price_range(inventory_df, low=19.99)
+        )
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_compact_margin_bounds_match(inventory_df, use_index):
+    compact_df = compact_inventory(inventory_df)
+    index = InventoryIndex(compact_df) if use_index else None
+    margin = (19.99 - 9.99) / 19.99
+
+    expected = filter_by_margin(inventory_df, low=margin, high=margin)
+    assert list(expected['sku']) == ['SKU-00003']
+    assert list(filter_by_margin(compact_df, low=margin, high=margin, index=index)['sku']) == ['SKU-00003']
+
+
+def test_compact_records_show_cents(inventory_df):
+    inventory_df.loc[3, 'price'] = 1.13
+    compact_df = compact_inventory(inventory_df)
+
+    assert search_by_sku(compact_df, 'SKU-00003')['price'] == 1.13
+    assert InventoryIndex(compact_df).lookup_sku('SKU-00003')['price'] == 1.13
+    assert filter_by_price_range(compact_df, 1.13, 1.13, view=True).record(0)['cost'] == 9.99
+    assert calculate_inventory_value(compact_df) == pytest.approx(calculate_inventory_value(inventory_df))
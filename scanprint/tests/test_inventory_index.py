@@ -0,0 +1,62 @@
+"""Incremental InventoryIndex updates must match an index built from scratch."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.inventory import filter_by_department
+from utils.inventory_index import InventoryIndex, _QUANTITY_REBUILD_THRESHOLD
+
+from inventory_helpers import assert_index_matches, make_inventory
+
+
+@pytest.mark.parametrize("changes", [1, 10, _QUANTITY_REBUILD_THRESHOLD + 1])
+def test_set_quantity_matches_rebuild(changes):
+    inventory_df = make_inventory(200)
+    index = InventoryIndex(inventory_df)
+    rng = np.random.default_rng(changes)
+
+    for position, quantity in zip(rng.integers(0, 200, changes), rng.integers(0, 8, changes)):
+        inventory_df = index.set_quantity(int(position), int(quantity))
+
+    assert inventory_df is index.df
+    assert_index_matches(index, inventory_df)
+
+
+def test_move_quantities_in_one_batch():
+    inventory_df = make_inventory(200)
+    index = InventoryIndex(inventory_df)
+    positions = [3, 150, 7, 199, 0, 42]
+    old = inventory_df['quantity'].iloc[positions].tolist()
+    new = [7, 0, old[2], 3, 3, 5]
+
+    inventory_df.iloc[positions, inventory_df.columns.get_loc('quantity')] = new
+    index._move_quantities(positions, old, new)
+
+    np.testing.assert_array_equal(index.quantity_order, InventoryIndex(inventory_df).quantity_order)
+    np.testing.assert_array_equal(index.sorted_quantities, np.sort(inventory_df['quantity'].to_numpy()))
+
+
+def test_move_quantities_leaves_copies_alone():
+    inventory_df = make_inventory(50)
+    index = InventoryIndex(inventory_df)
+    order = index.quantity_order.copy()
+    shared = index.quantity_order
+
+    index.set_quantity(10, 99)
+
+    np.testing.assert_array_equal(shared, order)
+    assert index.top_k_low_stock(50)[-1] == 10
+
+
+def test_set_quantity_leaves_views_of_the_old_frame_alone():
+    inventory_df = make_inventory(50)
+    index = InventoryIndex(inventory_df)
+    view = filter_by_department(inventory_df, inventory_df['department'].iloc[10], index=index, view=True)
+    before = view.to_frame()
+
+    new_df = index.set_quantity(10, 99)
+
+    assert inventory_df['quantity'].iloc[10] != 99 and new_df['quantity'].iloc[10] == 99
+    pd.testing.assert_frame_equal(view.to_frame(), before)
+    assert index.lookup_sku('SKU-00010')['quantity'] == 99
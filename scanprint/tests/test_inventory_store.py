@@ -0,0 +1,27 @@
+"""SQLite inventory store imports."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.inventory_store import InventoryStore, import_inventory, store_is_current
+
+from inventory_helpers import make_inventory
+
+
+def test_concurrent_imports_publish_a_complete_store(tmp_path):
+    csv_path = str(tmp_path / "export.csv")
+    export_df = make_inventory(2000)
+    export_df.columns = [column.replace('_', ' ').title() for column in export_df.columns]
+    export_df.rename(columns={'Sku': 'SKU'}).to_csv(csv_path, index=False)
+    db_path = str(tmp_path / "inventory.db")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for result in [executor.submit(import_inventory, csv_path, db_path, 500) for _ in range(4)]:
+            result.result()
+
+    # Every import replaced the store in one step and left no temp file behind
+    assert sorted(os.listdir(tmp_path)) == ["export.csv", "inventory.db"]
+    assert store_is_current(csv_path, db_path)
+    with InventoryStore(db_path) as store:
+        assert len(store) == 2000
+        assert store.search_by_sku("SKU-01999")["product_name"] == "Product 1999"
@@ -0,0 +1,82 @@
+"""Watermark refreshes must not miss writes landing in the watermark's second."""
+
+import sqlite3
+
+import pandas as pd
+
+from utils.inventory_turso import CLOCK_QUERY, TursoInventorySource
+
+from inventory_helpers import assert_index_matches
+
+
+class FakeClient:
+    """In-memory products table behind TursoClient's execute(), with a settable clock"""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            "CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT, description TEXT, "
+            "price REAL, sku TEXT, stock_quantity INTEGER, status TEXT, updated_at TEXT)"
+        )
+        self.now = "2026-01-01 10:00:00"
+
+    def execute(self, query, params=None):
+        if query == CLOCK_QUERY:
+            rows = [{"now": self.now}]
+        else:
+            rows = [dict(row) for row in self.conn.execute(query, params or [])]
+        return {"results": {"rows": rows}}
+
+    def write(self, product_id, quantity, status="active"):
+        """Insert or update a product, stamped with the current clock"""
+        self.conn.execute(
+            "INSERT INTO products VALUES (?, ?, '', ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "stock_quantity = excluded.stock_quantity, status = excluded.status, "
+            "updated_at = excluded.updated_at",
+            [product_id, f"Product {product_id}", 1.0 + product_id, f"SKU-{product_id}",
+             quantity, status, self.now]
+        )
+
+
+def quantities(source):
+    return dict(zip(source.inventory_df['sku'], source.inventory_df['quantity']))
+
+
+def test_refresh_across_writes_in_the_same_second():
+    client = FakeClient()
+    for product_id in range(1, 6):
+        client.write(product_id, 10)
+    source = TursoInventorySource(client, page_size=2)
+    source.load()
+
+    # Written and read within 10:00:05, so the second isn't finished yet
+    client.now = "2026-01-01 10:00:05"
+    client.write(7, 1)
+    source.refresh()
+    assert quantities(source)["SKU-7"] == 1
+
+    # Later in the same second: a lower id changes, another is retired, one is added
+    client.write(2, 3)
+    client.write(4, 0, status="archived")
+    client.write(6, 8)
+    _, _, diff = source.refresh()
+    assert len(diff.updated_positions) == 1 and len(diff.deleted_positions) == 1 and len(diff.inserted) == 1
+    assert quantities(source) == {"SKU-1": 10, "SKU-2": 3, "SKU-3": 10, "SKU-5": 10, "SKU-6": 8, "SKU-7": 1}
+
+    # Once the second has passed the watermark moves past its last row
+    client.now = "2026-01-01 10:00:06"
+    _, _, diff = source.refresh()
+    assert not diff
+    assert source.watermark == ("2026-01-01 10:00:05", 7)
+    _, _, diff = source.refresh()
+    assert not diff
+
+    fresh = TursoInventorySource(client)
+    fresh.load()
+    by_sku = lambda df: df.sort_values('sku').reset_index(drop=True)
+    pd.testing.assert_frame_equal(by_sku(source.inventory_df), by_sku(fresh.inventory_df))
+    assert_index_matches(source.index, source.inventory_df)
+    assert dict(zip(source.product_ids.tolist(), source.inventory_df['sku'])) == {
+        product_id: f"SKU-{product_id}" for product_id in (1, 2, 3, 5, 6, 7)
+    }
@@ -0,0 +1,66 @@
+"""Diffs applied through with_updates must leave the index as a rebuild would."""
+
+import pandas as pd
+import pytest
+
+from utils.inventory import compact_inventory
+from utils.inventory_index import InventoryIndex
+from utils.inventory_watch import apply_inventory_diff, diff_inventory
+
+from inventory_helpers import assert_index_matches, make_inventory
+
+
+def edit_rows(inventory_df, step):
+    """Change quantities, prices, groups and keys on a handful of rows"""
+    new_df = inventory_df.copy()
+    new_df.loc[[1, 5 + step, 60], 'quantity'] = [step, 0, 9 + step]
+    new_df.loc[[2, 40], 'price'] = [1.5 + step, 99.0]
+    new_df.loc[7, 'cost'] = 0.25 * step
+    new_df.loc[8 + step, 'department'] = f"Seasonal {step}"
+    new_df.loc[9, 'supplier'] = 'Initech'
+    new_df.loc[11, 'barcode'] = new_df.loc[12, 'barcode']
+    new_df.loc[13 + step, 'product_name'] = f"Renamed product {step}"
+    return new_df
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_updates_match_rebuild(compact):
+    export_df = make_inventory(200)
+    inventory_df = compact_inventory(export_df) if compact else export_df
+    index = InventoryIndex(inventory_df, name_search=True)
+
+    # Chained, so each with_updates starts from an incrementally built index
+    for step in range(3):
+        export_df = edit_rows(export_df, step)
+        new_df = compact_inventory(export_df) if compact else export_df
+        diff = diff_inventory(inventory_df, new_df)
+        assert diff is not None and not len(diff.inserted) and not len(diff.deleted_positions)
+
+        inventory_df, index = apply_inventory_diff(inventory_df, index, diff)
+
+        assert_index_matches(index, inventory_df)
+        assert index.search_name(f"Renamed product {step}", limit=1) == [13 + step]
+
+
+def test_mixed_diff_matches_rebuild():
+    inventory_df = make_inventory(200)
+    index = InventoryIndex(inventory_df)
+
+    edited = edit_rows(inventory_df, 0).drop(index=[0, 17, 18, 150])
+    inserted = make_inventory(5, seed=1)
+    inserted['sku'] = [f"NEW-{i}" for i in range(5)]
+    inserted['barcode'] = [f"9{i:011d}" for i in range(5)]
+    new_df = pd.concat([edited.iloc[:100], inserted, edited.iloc[100:]], ignore_index=True)
+
+    diff = diff_inventory(inventory_df, new_df)
+    assert len(diff.inserted) == 5 and len(diff.deleted_positions) == 4 and len(diff.updated_positions)
+    inventory_df, index = apply_inventory_diff(inventory_df, index, diff)
+    assert_index_matches(index, inventory_df)
+    assert sorted(inventory_df['sku']) == sorted(new_df['sku'])
+
+    # Rows moved, so the next update-only diff patches the rebuilt index
+    new_df = edit_rows(new_df, 1)
+    diff = diff_inventory(inventory_df, new_df)
+    assert not len(diff.inserted) and not len(diff.deleted_positions)
+    inventory_df, index = apply_inventory_diff(inventory_df, index, diff)
+    assert_index_matches(index, inventory_df)
@@ -0,0 +1,31 @@
+"""Ranking of NameSearchIndex results."""
+
+import pandas as pd
+
+from utils.name_search import NameSearchIndex
+
+
+def test_exact_match_survives_many_closer_short_names():
+    # Short "Mile" names share two of the three query trigrams and score well
+    # above the long name that actually contains the query
+    names = pd.Series([f"Mile marker {i}" for i in range(200)] + ["Organic whole milk 2 percent gallon"])
+    index = NameSearchIndex(names)
+
+    results = index.search("milk", limit=5)
+
+    assert results[0][0] == 200
+    assert results[0][1] > 1.0
+
+
+def test_contained_query_inside_a_word_ranks_first():
+    names = pd.Series(["Mild salsa", "Buttermilk pancake mix", "Milo cereal"])
+    index = NameSearchIndex(names)
+
+    assert index.search("milk", limit=1)[0][0] == 1
+
+
+def test_single_character_queries_match_word_prefixes():
+    names = pd.Series(["Apple juice", "Banana", "Baked apples", "Cherry"])
+    index = NameSearchIndex(names)
+
+    assert [position for position, _ in index.search("a")] == [0, 2]
@@ -1,14 +1,36 @@
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Union
 
+from .inventory_index import InventoryIndex, compute_margins, frame_records, money_values, value_contributions
+from .inventory_view import InventoryView
 
-def load_inventory(filepath: str) -> pd.DataFrame:
+try:
+    import pyarrow  # noqa: F401
+    COMPACT_STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    COMPACT_STRING_DTYPE = None
+
+# Columns every MarktPOS export must contain
+REQUIRED_COLUMNS = [
+    "Product Name", "SKU", "Barcode", "Department", 
+    "Price", "Cost", "Quantity"
+]
+
+# Low-cardinality columns stored as categoricals in compact mode
+CATEGORY_COLUMNS = ["department", "supplier"]
+# Free-text columns stored as Arrow-backed strings in compact mode
+STRING_COLUMNS = ["product_name", "sku", "barcode", "description"]
+
+
+def load_inventory(filepath: str, compact: bool = False) -> pd.DataFrame:
     """
     Load inventory data from MarktPOS CSV export.
     
     Args:
         filepath: Path to the CSV file
+        compact: Store columns in smaller types (see compact_inventory)
         
     Returns:
         DataFrame containing inventory data
@@ -24,15 +46,28 @@ def load_inventory(filepath: str) -> pd.DataFrame:
     df = pd.read_csv(filepath)
     
     # Check for required columns
-    required_columns = [
-        "Product Name", "SKU", "Barcode", "Department", 
-        "Price", "Cost", "Quantity"
-    ]
-    
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_columns:
         raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
     
+    df = normalize_inventory(df)
+    
+    if compact:
+        df = compact_inventory(df)
+    
+    return df
+
+
+def normalize_inventory(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename MarktPOS columns and convert them to the types the app expects.
+    
+    Args:
+        df: Raw DataFrame with the export's column names
+        
+    Returns:
+        The same DataFrame with normalized column names and types
+    """
     # Convert column names to lowercase with underscores for easier access
     df.columns = [col.lower().replace(' ', '_') for col in df.columns]
     
@@ -50,17 +85,88 @@ def load_inventory(filepath: str) -> pd.DataFrame:
     return df
 
 
-def search_by_barcode(inventory_df: pd.DataFrame, barcode: str) -> Optional[Dict[str, Any]]:
+def compact_inventory(inventory_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a loaded inventory to memory-saving column types.
+    
+    Department and supplier become categoricals, price and cost float32,
+    quantity int32, and text columns Arrow-backed strings when pyarrow is
+    installed. float32 does not hold most cent amounts exactly (19.99 is
+    stored as 19.9899997...), so filters, valuation and record dicts round
+    price and cost back to the cent when they read them; use the columns
+    through those helpers rather than comparing them directly.
+    
+    Args:
+        inventory_df: Inventory DataFrame from load_inventory
+        
+    Returns:
+        New DataFrame with compact column types
+    """
+    dtypes: Dict[str, Any] = {}
+    
+    for column in CATEGORY_COLUMNS:
+        if column in inventory_df.columns:
+            dtypes[column] = 'category'
+    
+    for column in ('price', 'cost'):
+        dtypes[column] = 'float32'
+    dtypes['quantity'] = 'int32'
+    
+    if COMPACT_STRING_DTYPE is not None:
+        for column in STRING_COLUMNS:
+            if column in inventory_df.columns:
+                dtypes[column] = COMPACT_STRING_DTYPE
+    
+    return inventory_df.astype(dtypes)
+
+
+def memory_report(inventory_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Measure how much memory an inventory DataFrame uses.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        
+    Returns:
+        Dictionary with total bytes, bytes per row, and per-column bytes and dtypes
+    """
+    usage = inventory_df.memory_usage(deep=True)
+    total = int(usage.sum())
+    rows = len(inventory_df)
+    
+    return {
+        'rows': rows,
+        'total_bytes': total,
+        'bytes_per_row': total / rows if rows else 0.0,
+        'columns': {
+            column: {
+                'dtype': str(inventory_df[column].dtype),
+                'bytes': int(usage[column])
+            }
+            for column in inventory_df.columns
+        }
+    }
+
+
+def search_by_barcode(
+    inventory_df: pd.DataFrame,
+    barcode: str,
+    index: Optional[InventoryIndex] = None
+) -> Optional[Dict[str, Any]]:
     """
     Find an item by its barcode.
     
     Args:
         inventory_df: Inventory DataFrame
         barcode: Barcode to search for
+        index: Optional prebuilt index for a constant-time lookup
         
     Returns:
         Dictionary with item data or None if not found
     """
+    if index is not None:
+        return index.lookup_barcode(barcode)
+    
     # Convert barcode to string to ensure matching works correctly
     barcode = str(barcode).strip()
     
@@ -71,20 +177,67 @@ def search_by_barcode(inventory_df: pd.DataFrame, barcode: str) -> Optional[Dict
         return None
     
     # Convert the first matching row to a dictionary
-    return result.iloc[0].to_dict()
+    return frame_records(result.iloc[:1])[0]
+
+
+def search_by_barcodes(
+    inventory_df: pd.DataFrame,
+    barcodes: Iterable[str],
+    index: Optional[InventoryIndex] = None
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Find many items by barcode at once, e.g. a scanned pallet.
+    
+    Barcodes are stripped and blank entries ignored. Each barcode resolves to
+    the first item with that barcode, as in search_by_barcode.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        barcodes: Barcodes to look up (repeats are kept)
+        index: Optional prebuilt index for hash lookups
+        
+    Returns:
+        Tuple of (item dictionaries for the found barcodes in input order,
+        barcodes that were not found in input order)
+    """
+    barcodes = [str(barcode).strip() for barcode in barcodes]
+    barcodes = [barcode for barcode in barcodes if barcode]
+    if not barcodes:
+        return [], []
+    
+    if index is not None:
+        positions = index.positions_of_barcodes(barcodes)
+    else:
+        # One join against the first row of each barcode
+        first_rows = inventory_df['barcode'].reset_index(drop=True).drop_duplicates(keep='first')
+        lookup = pd.Index(first_rows.to_numpy()).get_indexer(barcodes)
+        positions = np.where(lookup >= 0, first_rows.index.to_numpy()[lookup], -1)
+    
+    found = positions >= 0
+    records = frame_records(inventory_df.take(positions[found]))
+    not_found = [barcode for barcode, hit in zip(barcodes, found) if not hit]
+    return records, not_found
 
 
-def search_by_sku(inventory_df: pd.DataFrame, sku: str) -> Optional[Dict[str, Any]]:
+def search_by_sku(
+    inventory_df: pd.DataFrame,
+    sku: str,
+    index: Optional[InventoryIndex] = None
+) -> Optional[Dict[str, Any]]:
     """
     Find an item by its SKU.
     
     Args:
         inventory_df: Inventory DataFrame
         sku: SKU to search for
+        index: Optional prebuilt index for a constant-time lookup
         
     Returns:
         Dictionary with item data or None if not found
     """
+    if index is not None:
+        return index.lookup_sku(sku)
+    
     # Convert SKU to string and strip whitespace
     sku = str(sku).strip()
     
@@ -95,128 +248,376 @@ def search_by_sku(inventory_df: pd.DataFrame, sku: str) -> Optional[Dict[str, An
         return None
     
     # Convert the first matching row to a dictionary
-    return result.iloc[0].to_dict()
+    return frame_records(result.iloc[:1])[0]
 
 
-def search_by_name(inventory_df: pd.DataFrame, name: str) -> pd.DataFrame:
+def search_by_name(
+    inventory_df: pd.DataFrame,
+    name: str,
+    index: Optional[InventoryIndex] = None,
+    limit: int = 20,
+    view: bool = False
+) -> Union[pd.DataFrame, InventoryView]:
     """
     Search for items by product name (partial match).
     
     Args:
         inventory_df: Inventory DataFrame
         name: Product name to search for (partial match)
+        index: Optional prebuilt index; results are then ranked by similarity,
+            tolerate typos and are capped at ``limit``
+        limit: Maximum number of results when searching through the index
+        view: Return a read-only InventoryView instead of a copied DataFrame
         
     Returns:
-        DataFrame with matching items
+        DataFrame (or view) with matching items
     """
-    # Case-insensitive search using string contains
-    result = inventory_df[inventory_df['product_name'].str.contains(name, case=False, na=False)]
-    return result.copy()
+    if index is not None:
+        positions = index.search_name(name, limit)
+    else:
+        # Case-insensitive search using string contains
+        positions = inventory_df['product_name'].str.contains(name, case=False, na=False).to_numpy().nonzero()[0]
+    
+    return _select(inventory_df, positions, view)
+
 
+def _select(inventory_df: pd.DataFrame, positions: Any, view: bool) -> Union[pd.DataFrame, InventoryView]:
+    """Return the rows at the given positions as a view or as a new DataFrame"""
+    if view:
+        return InventoryView(inventory_df, positions)
+    return inventory_df.take(positions)
 
-def get_departments(inventory_df: pd.DataFrame) -> List[str]:
+
+def get_departments(inventory_df: pd.DataFrame, index: Optional[InventoryIndex] = None) -> List[str]:
     """
     Get a list of unique departments.
     
     Args:
         inventory_df: Inventory DataFrame
+        index: Optional prebuilt index with the department groups
         
     Returns:
         List of unique department names
     """
+    if index is not None:
+        return index.group_keys('department')
+    
     return sorted(inventory_df['department'].unique().tolist())
 
 
-def filter_by_department(inventory_df: pd.DataFrame, department: str) -> pd.DataFrame:
+def filter_by_department(
+    inventory_df: pd.DataFrame,
+    department: str,
+    index: Optional[InventoryIndex] = None,
+    view: bool = False
+) -> Union[pd.DataFrame, InventoryView]:
     """
     Filter inventory items by department.
     
     Args:
         inventory_df: Inventory DataFrame
         department: Department name to filter by
+        index: Optional prebuilt index; rows are then taken by position
+        view: Return a read-only InventoryView instead of a copied DataFrame
         
     Returns:
-        DataFrame with items in the specified department
+        DataFrame (or view) with items in the specified department
     """
-    result = inventory_df[inventory_df['department'] == department]
-    return result.copy()
+    if index is not None:
+        positions = index.group_positions('department', department)
+    else:
+        positions = (inventory_df['department'] == department).to_numpy().nonzero()[0]
+    
+    return _select(inventory_df, positions, view)
 
 
-def get_suppliers(inventory_df: pd.DataFrame) -> List[str]:
+def get_suppliers(inventory_df: pd.DataFrame, index: Optional[InventoryIndex] = None) -> List[str]:
     """
     Get a list of unique suppliers.
     
     Args:
         inventory_df: Inventory DataFrame
+        index: Optional prebuilt index with the supplier groups
         
     Returns:
         List of unique supplier names
     """
+    if index is not None:
+        return index.group_keys('supplier')
+    
     return sorted(inventory_df['supplier'].unique().tolist())
 
 
-def filter_by_supplier(inventory_df: pd.DataFrame, supplier: str) -> pd.DataFrame:
+def filter_by_supplier(
+    inventory_df: pd.DataFrame,
+    supplier: str,
+    index: Optional[InventoryIndex] = None,
+    view: bool = False
+) -> Union[pd.DataFrame, InventoryView]:
     """
     Filter inventory items by supplier.
     
     Args:
         inventory_df: Inventory DataFrame
         supplier: Supplier name to filter by
+        index: Optional prebuilt index; rows are then taken by position
+        view: Return a read-only InventoryView instead of a copied DataFrame
         
     Returns:
-        DataFrame with items from the specified supplier
+        DataFrame (or view) with items from the specified supplier
     """
-    result = inventory_df[inventory_df['supplier'] == supplier]
-    return result.copy()
+    if index is not None:
+        positions = index.group_positions('supplier', supplier)
+    else:
+        positions = (inventory_df['supplier'] == supplier).to_numpy().nonzero()[0]
+    
+    return _select(inventory_df, positions, view)
 
 
-def get_low_stock_items(inventory_df: pd.DataFrame, threshold: int = 10) -> pd.DataFrame:
+def get_low_stock_items(
+    inventory_df: pd.DataFrame,
+    threshold: int = 10,
+    view: bool = False,
+    index: Optional[InventoryIndex] = None
+) -> Union[pd.DataFrame, InventoryView]:
     """
     Get items with stock quantity below a certain threshold.
     
     Args:
         inventory_df: Inventory DataFrame
         threshold: Quantity threshold
+        view: Return a read-only InventoryView instead of a copied DataFrame
+        index: Optional prebuilt index; the rows are then a slice of its
+            quantity order, with no filtering or sorting
         
     Returns:
-        DataFrame with low stock items
+        DataFrame (or view) with low stock items
     """
+    if index is not None:
+        return _select(inventory_df, index.low_stock_positions(threshold), view)
+    
+    if view:
+        positions = (inventory_df['quantity'] <= threshold).to_numpy().nonzero()[0]
+        return InventoryView(inventory_df, positions).sort_by('quantity')
+    
     result = inventory_df[inventory_df['quantity'] <= threshold].sort_values('quantity', ascending=True)
     return result.copy()
 
 
-def get_overstock_items(inventory_df: pd.DataFrame, threshold: int = 100) -> pd.DataFrame:
+def get_overstock_items(
+    inventory_df: pd.DataFrame,
+    threshold: int = 100,
+    view: bool = False,
+    index: Optional[InventoryIndex] = None
+) -> Union[pd.DataFrame, InventoryView]:
     """
     Get items with stock quantity above a certain threshold.
     
     Args:
         inventory_df: Inventory DataFrame
         threshold: Quantity threshold
+        view: Return a read-only InventoryView instead of a copied DataFrame
+        index: Optional prebuilt index; the rows are then a slice of its
+            quantity order, with no filtering or sorting
         
     Returns:
-        DataFrame with overstock items
+        DataFrame (or view) with overstock items
     """
+    if index is not None:
+        return _select(inventory_df, index.overstock_positions(threshold), view)
+    
+    if view:
+        positions = (inventory_df['quantity'] >= threshold).to_numpy().nonzero()[0]
+        return InventoryView(inventory_df, positions).sort_by('quantity', ascending=False)
+    
     result = inventory_df[inventory_df['quantity'] >= threshold]
     result = result.sort_values(by='quantity', ascending=False)
     return result.copy()
 
 
-def calculate_inventory_value(inventory_df: pd.DataFrame) -> Dict[str, float]:
+def top_k_low_stock(
+    inventory_df: pd.DataFrame,
+    k: int = 20,
+    view: bool = False,
+    index: Optional[InventoryIndex] = None
+) -> Union[pd.DataFrame, InventoryView]:
+    """
+    Get the k items with the lowest stock quantity.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        k: Number of items
+        view: Return a read-only InventoryView instead of a copied DataFrame
+        index: Optional prebuilt index; the rows are then read straight off
+            its quantity order
+        
+    Returns:
+        DataFrame (or view) with the k lowest-stock items, lowest first
+    """
+    if index is not None:
+        positions = index.top_k_low_stock(k)
+    else:
+        # Partition first so only the k smallest need sorting
+        quantities = inventory_df['quantity'].to_numpy()
+        k = max(0, min(k, len(quantities)))
+        positions = np.argpartition(quantities, k - 1)[:k] if 0 < k < len(quantities) else np.arange(k)
+        positions = positions[np.argsort(quantities[positions], kind='stable')]
+    
+    return _select(inventory_df, positions, view)
+
+
+def _within_department(
+    inventory_df: pd.DataFrame,
+    positions: np.ndarray,
+    department: Optional[str],
+    index: Optional[InventoryIndex]
+) -> np.ndarray:
+    """Keep the positions whose row is in a department, preserving their order"""
+    if department is None:
+        return positions
+    if index is not None:
+        return positions[index.in_group('department', department, positions)]
+    return positions[inventory_df['department'].to_numpy()[positions] == department]
+
+
+def filter_by_price_range(
+    inventory_df: pd.DataFrame,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    department: Optional[str] = None,
+    index: Optional[InventoryIndex] = None,
+    view: bool = False
+) -> Union[pd.DataFrame, InventoryView]:
+    """
+    Get items priced within a band, cheapest first.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        low: Minimum price, inclusive (None for no lower bound)
+        high: Maximum price, inclusive (None for no upper bound)
+        department: Only include items from this department
+        index: Optional prebuilt index; the band is then a slice of its
+            price order
+        view: Return a read-only InventoryView instead of a copied DataFrame
+        
+    Returns:
+        DataFrame (or view) with items in the price band
+    """
+    if index is not None:
+        positions = index.price_range_positions(low, high)
+    else:
+        prices = money_values(inventory_df, 'price')
+        mask = ~np.isnan(prices)
+        if low is not None:
+            mask &= prices >= low
+        if high is not None:
+            mask &= prices <= high
+        positions = mask.nonzero()[0]
+        positions = positions[np.argsort(prices[positions], kind='stable')]
+    
+    return _select(inventory_df, _within_department(inventory_df, positions, department, index), view)
+
+
+def filter_by_margin(
+    inventory_df: pd.DataFrame,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    department: Optional[str] = None,
+    index: Optional[InventoryIndex] = None,
+    view: bool = False
+) -> Union[pd.DataFrame, InventoryView]:
+    """
+    Get items whose margin, (price - cost) / price, is within a band, lowest first.
+    
+    Items without a positive price have no margin and are never included.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        low: Minimum margin as a fraction, inclusive (e.g. 0.2 for 20%)
+        high: Maximum margin, inclusive (None for no upper bound)
+        department: Only include items from this department
+        index: Optional prebuilt index; the band is then a slice of its
+            margin order
+        view: Return a read-only InventoryView instead of a copied DataFrame
+        
+    Returns:
+        DataFrame (or view) with items in the margin band
+    """
+    if index is not None:
+        positions = index.margin_range_positions(low, high)
+    else:
+        margins = compute_margins(inventory_df)
+        mask = ~np.isnan(margins)
+        if low is not None:
+            mask &= margins >= low
+        if high is not None:
+            mask &= margins <= high
+        positions = mask.nonzero()[0]
+        positions = positions[np.argsort(margins[positions], kind='stable')]
+    
+    return _select(inventory_df, _within_department(inventory_df, positions, department, index), view)
+
+
+def calculate_inventory_value(
+    inventory_df: pd.DataFrame,
+    index: Optional[InventoryIndex] = None
+) -> Dict[str, float]:
     """
     Calculate the total value of inventory at cost and retail prices.
     
     Args:
         inventory_df: Inventory DataFrame
+        index: Optional prebuilt index; its running totals are returned
+            without recomputing
         
     Returns:
         Dictionary with total cost and retail values
     """
+    if index is not None:
+        return index.valuation()
+    
     # Calculate extended cost (cost * quantity) and retail value (price * quantity)
-    cost_value = (inventory_df['cost'] * inventory_df['quantity']).sum()
-    retail_value = (inventory_df['price'] * inventory_df['quantity']).sum()
+    cost_value, retail_value = value_contributions(inventory_df).sum(axis=0)
     
     return {
         'cost_value': cost_value,
         'retail_value': retail_value,
         'potential_profit': retail_value - cost_value
-    }
\ No newline at end of file
+    }
+
+
+def calculate_inventory_value_by(
+    inventory_df: pd.DataFrame,
+    by: str = 'department',
+    index: Optional[InventoryIndex] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Calculate inventory value at cost and retail per department or supplier.
+    
+    Args:
+        inventory_df: Inventory DataFrame
+        by: Column to group by ('department' or 'supplier')
+        index: Optional prebuilt index; its running per-group totals are
+            returned without recomputing
+        
+    Returns:
+        Dictionary of group name -> dictionary with cost_value, retail_value
+        and potential_profit, ordered by group name
+    """
+    if index is not None:
+        return index.valuation(by)
+    
+    # One grouped pass over the extended values
+    contributions = value_contributions(inventory_df)
+    values = pd.DataFrame({
+        by: inventory_df[by].to_numpy(),
+        'cost_value': contributions[:, 0],
+        'retail_value': contributions[:, 1]
+    })
+    totals = values.groupby(by, sort=True, observed=True).sum()
+    totals['potential_profit'] = totals['retail_value'] - totals['cost_value']
+    
+    return {
+        key: {name: float(value) for name, value in row.items()}
+        for key, row in totals.to_dict('index').items()
+    }
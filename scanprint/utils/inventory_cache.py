@@ -0,0 +1,189 @@
+import os
+import json
+import pickle
+import hashlib
+import pandas as pd
+from typing import Callable, Dict, Optional, Any, Tuple
+
+from .inventory import load_inventory
+from .inventory_index import InventoryIndex
+
+# Bump when the cached layout or the normalization in load_inventory changes
+CACHE_VERSION = 5
+
+try:
+    from pyarrow import feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def file_fingerprint(filepath: str, with_hash: bool = True) -> Dict[str, Any]:
+    """
+    Describe a file well enough to tell whether it changed.
+
+    Args:
+        filepath: Path to the file
+        with_hash: Also compute the SHA-256 of the contents
+
+    Returns:
+        Dictionary with size, mtime_ns and (optionally) sha256
+    """
+    stat = os.stat(filepath)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        fingerprint['sha256'] = digest.hexdigest()
+
+    return fingerprint
+
+
+def _cache_paths(filepath: str, cache_dir: Optional[str]) -> Dict[str, str]:
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filepath)), '.cache')
+    stem = os.path.join(cache_dir, os.path.basename(filepath))
+    data_ext = '.feather' if HAS_PYARROW else '.pkl'
+    return {
+        'dir': cache_dir,
+        'meta': stem + '.meta.json',
+        'data': stem + data_ext,
+        'index': stem + '.index.pkl',
+    }
+
+
+def _read_meta(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path: str, write: Callable[[str], None]) -> None:
+    """Write to a temporary file and move it into place"""
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _is_current(meta: Optional[Dict[str, Any]], filepath: str, options: Dict[str, Any]) -> bool:
+    """
+    Check a cache entry against the source file.
+
+    Size and mtime are compared first; the content hash is only computed when
+    the mtime moved (e.g. the export was copied again unchanged).
+    """
+    if not meta or meta.get('version') != CACHE_VERSION or meta.get('options') != options:
+        return False
+
+    quick = file_fingerprint(filepath, with_hash=False)
+    if quick['size'] != meta['source']['size']:
+        return False
+    if quick['mtime_ns'] == meta['source']['mtime_ns']:
+        return True
+
+    return file_fingerprint(filepath)['sha256'] == meta['source']['sha256']
+
+
+def load_inventory_cached(
+    filepath: str,
+    cache_dir: Optional[str] = None,
+    **load_options: Any
+) -> Tuple[pd.DataFrame, InventoryIndex]:
+    """
+    Load inventory through an on-disk cache of the parsed data.
+
+    On the first load the CSV is parsed with load_inventory and the normalized
+    DataFrame is written as Feather (when pyarrow is installed, read back
+    memory-mapped) or as a pickle, next to the saved InventoryIndex. Later
+    loads reuse the cache while the CSV's size, mtime or content hash match.
+
+    Args:
+        filepath: Path to the MarktPOS CSV export
+        cache_dir: Cache directory (defaults to a .cache folder next to the CSV)
+        **load_options: Extra keyword arguments for load_inventory; they are
+            part of the cache key
+
+    Returns:
+        Tuple of (inventory DataFrame, InventoryIndex)
+
+    Raises:
+        FileNotFoundError: If the inventory file doesn't exist
+        ValueError: If the CSV is missing required columns
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Inventory file not found: {filepath}")
+
+    paths = _cache_paths(filepath, cache_dir)
+    options = dict(sorted(load_options.items()))
+    meta = _read_meta(paths['meta'])
+
+    if _is_current(meta, filepath, options):
+        try:
+            if HAS_PYARROW:
+                df = feather.read_table(paths['data'], memory_map=True).to_pandas()
+            else:
+                df = pd.read_pickle(paths['data'])
+            with open(paths['index'], 'rb') as f:
+                index = InventoryIndex.from_state(df, pickle.load(f))
+
+            # The mtime moved but the content didn't; refresh it for next time
+            source = file_fingerprint(filepath, with_hash=False)
+            if source['mtime_ns'] != meta['source']['mtime_ns']:
+                meta['source'].update(source)
+                _write_atomic(paths['meta'], lambda p: _dump_json(meta, p))
+
+            return df, index
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            # Corrupt or partial cache; fall through and rebuild it
+            pass
+
+    source = file_fingerprint(filepath)
+    df = load_inventory(filepath, **load_options)
+    index = InventoryIndex(df)
+
+    try:
+        os.makedirs(paths['dir'], exist_ok=True)
+        if HAS_PYARROW:
+            _write_atomic(paths['data'], df.to_feather)
+        else:
+            _write_atomic(paths['data'], df.to_pickle)
+        _write_atomic(paths['index'], lambda p: _dump_pickle(index.get_state(), p))
+        # Metadata goes last so a crash mid-write never validates a partial cache
+        _write_atomic(paths['meta'], lambda p: _dump_json({
+            'version': CACHE_VERSION,
+            'source': source,
+            'options': options,
+        }, p))
+    except OSError as e:
+        print(f"WARNING: Could not write inventory cache: {e}")
+
+    return df, index
+
+
+def clear_inventory_cache(filepath: str, cache_dir: Optional[str] = None) -> None:
+    """
+    Delete the cached data for an inventory file.
+
+    Args:
+        filepath: Path to the MarktPOS CSV export
+        cache_dir: Cache directory used when loading
+    """
+    paths = _cache_paths(filepath, cache_dir)
+    for key in ('meta', 'data', 'index'):
+        if os.path.exists(paths[key]):
+            os.remove(paths[key])
+
+
+def _dump_json(data: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def _dump_pickle(data: Any, path: str) -> None:
+    with open(path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
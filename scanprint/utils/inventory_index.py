@@ -0,0 +1,664 @@
+import copy
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Any, Tuple
+
+from .name_search import NameSearchIndex
+
+
+def _build_key_map(values: pd.Series) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """
+    Map each key to the position of its first row.
+
+    Args:
+        values: Key column in row order
+
+    Returns:
+        Tuple of (key -> first position, key -> all positions for duplicated keys)
+    """
+    keys = values.tolist()
+    # Building from the end keeps the first occurrence of each key
+    positions = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+    # Blank keys come from missing values and never match a scan
+    positions.pop('', None)
+
+    duplicates: Dict[str, List[int]] = {}
+    if len(positions) < len(keys) - keys.count(''):
+        repeated = values.reset_index(drop=True)
+        repeated = repeated[repeated.duplicated(keep=False) & (repeated != '')]
+        for key, group in repeated.groupby(repeated, sort=False).groups.items():
+            duplicates[key] = [int(position) for position in group]
+
+    return positions, duplicates
+
+
+def _build_groups(values: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Map each distinct value to the positions of its rows.
+
+    Args:
+        values: Group column in row order
+
+    Returns:
+        Dictionary of value -> ascending row positions, ordered by value;
+        missing values are left out
+    """
+    values = values.reset_index(drop=True)
+    groups = values.groupby(values, sort=True, observed=True).indices
+    return {key: positions.astype(np.int64) for key, positions in groups.items()}
+
+
+def _is_float32(dtype: Any) -> bool:
+    # Arrow-backed columns (shared inventories) report their numpy equivalent
+    return getattr(dtype, 'numpy_dtype', dtype) == np.float32
+
+
+def money_values(inventory_df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Read a price or cost column as float64.
+
+    Compact inventories store these as float32, which cannot hold most cent
+    amounts exactly (19.99 becomes 19.9899997...). Their values are rounded
+    back to the cent so comparisons and sums agree with the full-size frame.
+
+    Args:
+        inventory_df: Inventory DataFrame
+        column: 'price' or 'cost'
+
+    Returns:
+        Float64 array of the column's values (NaN where missing)
+    """
+    values = inventory_df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    if _is_float32(inventory_df[column].dtype):
+        values = np.round(values, 2)
+    return values
+
+
+def frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert rows to record dicts, with compact prices and costs back at the cent.
+
+    Args:
+        frame: Rows of an inventory DataFrame
+
+    Returns:
+        One dictionary per row, in row order
+    """
+    records = frame.to_dict('records')
+    for column in ('price', 'cost'):
+        if column in frame.columns and _is_float32(frame[column].dtype):
+            for record in records:
+                if pd.notna(record[column]):
+                    record[column] = round(float(record[column]), 2)
+    return records
+
+
+def compute_margins(inventory_df: pd.DataFrame) -> np.ndarray:
+    """
+    Gross margin of each row as a fraction of price: (price - cost) / price.
+
+    Args:
+        inventory_df: Inventory DataFrame
+
+    Returns:
+        Array of margins (NaN where the price is missing or not positive)
+    """
+    price = money_values(inventory_df, 'price')
+    cost = money_values(inventory_df, 'cost')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margins = (price - cost) / price
+    margins[~(price > 0)] = np.nan
+    return margins
+
+
+def _sorted_order(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Stable sort order of an array and the values in that order (NaN last)"""
+    order = np.argsort(values, kind='stable').astype(np.int64)
+    return order, values[order]
+
+
+def _range_slice(sorted_values: np.ndarray, low: Optional[float], high: Optional[float]) -> slice:
+    """Slice of a sorted float array holding values in [low, high]; NaN (sorted last) never matches"""
+    start = int(np.searchsorted(sorted_values, -np.inf if low is None else low, side='left'))
+    end = int(np.searchsorted(sorted_values, np.inf if high is None else high, side='right'))
+    return slice(start, max(start, end))
+
+
+def _group_codes(groups: Dict[str, np.ndarray], size: int) -> np.ndarray:
+    """Per-row number of each row's group in ``groups`` order (-1 for missing values)"""
+    codes = np.full(size, -1, dtype=np.int32)
+    for code, positions in enumerate(groups.values()):
+        codes[positions] = code
+    return codes
+
+
+def value_contributions(inventory_df: pd.DataFrame, positions: Any = None) -> np.ndarray:
+    """
+    Extended cost and retail value (cost * quantity, price * quantity) per row.
+
+    Args:
+        inventory_df: Inventory DataFrame
+        positions: Optional row positions to limit the result to
+
+    Returns:
+        Array of shape (rows, 2); missing prices and costs count as zero
+    """
+    cost, price = money_values(inventory_df, 'cost'), money_values(inventory_df, 'price')
+    quantity = inventory_df['quantity'].to_numpy(dtype=np.float64)
+    if positions is not None:
+        cost, price, quantity = cost[positions], price[positions], quantity[positions]
+    return np.nan_to_num(np.column_stack((cost * quantity, price * quantity)))
+
+
+# Above this many changed quantities, re-sorting beats moving entries one by one
+_QUANTITY_REBUILD_THRESHOLD = 64
+
+
+# Columns whose groups are precomputed for department and supplier filters
+GROUP_COLUMNS = ('department', 'supplier')
+
+
+class InventoryIndex:
+    """
+    Hash index over an inventory DataFrame for constant-time lookups.
+
+    Built once after loading, it maps barcodes and SKUs to row positions. When a
+    key appears more than once, lookups return the first row (like the
+    DataFrame scan they replace) and the key is reported in ``duplicates()``.
+    Departments and suppliers are grouped into sorted position arrays so
+    filters can take their rows directly, and row positions are kept sorted by
+    quantity, price and margin so threshold and range queries are binary
+    searches.
+
+    Record dicts are materialized on first lookup and cached, or all at once
+    when ``materialize`` is True. The product name search index is built on
+    first use, or up front when ``name_search`` is True.
+    """
+
+    def __init__(self, inventory_df: pd.DataFrame, materialize: bool = False, name_search: bool = False):
+        """
+        Build the index.
+
+        Args:
+            inventory_df: Inventory DataFrame from load_inventory
+            materialize: Convert every row to a record dict up front
+            name_search: Build the product name search index up front
+        """
+        self.df = inventory_df
+        self.materialize = materialize
+        self.rebuild()
+        if name_search:
+            self._names = NameSearchIndex(inventory_df['product_name'])
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Export the lookup structures so they can be saved alongside the DataFrame.
+
+        Returns:
+            Picklable dictionary accepted by ``from_state``
+        """
+        return {
+            'barcode_positions': self.barcode_positions,
+            'duplicate_barcodes': self.duplicate_barcodes,
+            'sku_positions': self.sku_positions,
+            'duplicate_skus': self.duplicate_skus,
+            'groups': self.groups,
+            'group_codes': self.group_codes,
+            'quantity_order': self.quantity_order,
+            'sorted_quantities': self.sorted_quantities,
+            'margins': self.margins,
+            'price_order': self.price_order,
+            'sorted_prices': self.sorted_prices,
+            'margin_order': self.margin_order,
+            'sorted_margins': self.sorted_margins,
+            'value_totals': self.value_totals,
+        }
+
+    @classmethod
+    def from_state(cls, inventory_df: pd.DataFrame, state: Dict[str, Any]) -> 'InventoryIndex':
+        """
+        Recreate an index from ``get_state`` output without rebuilding it.
+
+        Args:
+            inventory_df: The DataFrame the state was built from
+            state: Saved index state
+
+        Returns:
+            The restored index
+        """
+        index = cls.__new__(cls)
+        index.df = inventory_df
+        index.materialize = False
+        index._records = {}
+        index._names = None
+        for name, value in state.items():
+            setattr(index, name, value)
+        return index
+
+    def rebuild(self) -> None:
+        """Rebuild every lookup structure from the current DataFrame."""
+        self.barcode_positions, self.duplicate_barcodes = _build_key_map(self.df['barcode'])
+        self.sku_positions, self.duplicate_skus = _build_key_map(self.df['sku'])
+        self.groups: Dict[str, Dict[str, np.ndarray]] = {
+            column: _build_groups(self.df[column])
+            for column in GROUP_COLUMNS if column in self.df.columns
+        }
+        self.group_codes: Dict[str, np.ndarray] = {
+            column: _group_codes(groups, len(self.df)) for column, groups in self.groups.items()
+        }
+        self._sort_quantities()
+        self._sort_prices()
+        self._total_values()
+
+        if self.materialize:
+            self._records: Dict[int, Dict[str, Any]] = dict(
+                enumerate(frame_records(self.df))
+            )
+        else:
+            self._records = {}
+
+        self._names: Optional[NameSearchIndex] = None
+
+    def _sort_quantities(self) -> None:
+        quantities = self.df['quantity'].to_numpy()
+        # Stable, so rows with equal quantity stay in row order
+        self.quantity_order = np.argsort(quantities, kind='stable').astype(np.int64)
+        self.sorted_quantities = quantities[self.quantity_order]
+
+    def _sort_prices(self) -> None:
+        self.margins = compute_margins(self.df)
+        self.price_order, self.sorted_prices = _sorted_order(money_values(self.df, 'price'))
+        self.margin_order, self.sorted_margins = _sorted_order(self.margins)
+
+    def _total_values(self) -> None:
+        """Sum extended cost and retail overall and per group in one pass"""
+        values = value_contributions(self.df)
+        totals = {'': values.sum(axis=0)}
+        for column, codes in self.group_codes.items():
+            present = codes >= 0
+            totals[column] = np.column_stack([
+                np.bincount(codes[present], weights=values[present, i], minlength=len(self.groups[column]))
+                for i in range(2)
+            ])
+        self.value_totals: Dict[str, np.ndarray] = totals
+
+    def _adjust_values(self, positions: Any, old_values: np.ndarray, new_values: np.ndarray) -> None:
+        """Move the running totals by the change in some rows' contributions"""
+        delta = new_values - old_values
+        totals = {'': self.value_totals[''] + delta.sum(axis=0)}
+        for column, codes in self.group_codes.items():
+            group_totals = self.value_totals[column].copy()
+            row_codes = codes[positions]
+            present = row_codes >= 0
+            np.add.at(group_totals, row_codes[present], delta[present])
+            totals[column] = group_totals
+        # Replaced rather than updated in place, as index copies share them
+        self.value_totals = totals
+
+    def _move_quantities(self, positions: List[int], old: List[int], new: List[int]) -> None:
+        """Reposition rows in the quantity order after their quantities changed"""
+        if len(positions) > _QUANTITY_REBUILD_THRESHOLD:
+            self._sort_quantities()
+            return
+
+        order, sorted_quantities = self.quantity_order, self.sorted_quantities
+        for position, old_quantity, new_quantity in zip(positions, old, new):
+            if old_quantity == new_quantity:
+                continue
+            # Equal quantities are ordered by position, so (quantity, position)
+            # pins down each slot
+            low = int(np.searchsorted(sorted_quantities, old_quantity, side='left'))
+            high = int(np.searchsorted(sorted_quantities, old_quantity, side='right'))
+            slot = low + int(np.searchsorted(order[low:high], position))
+            order = np.delete(order, slot)
+            sorted_quantities = np.delete(sorted_quantities, slot)
+
+            low = int(np.searchsorted(sorted_quantities, new_quantity, side='left'))
+            high = int(np.searchsorted(sorted_quantities, new_quantity, side='right'))
+            slot = low + int(np.searchsorted(order[low:high], position))
+            order = np.insert(order, slot, position)
+            sorted_quantities = np.insert(sorted_quantities, slot, new_quantity)
+
+        # New arrays, so indexes sharing the old ones are unaffected
+        self.quantity_order, self.sorted_quantities = order, sorted_quantities
+
+    def set_quantity(self, position: int, quantity: int) -> pd.DataFrame:
+        """
+        Change a row's quantity and keep the index in step.
+
+        The DataFrame is not modified; ``self.df`` is replaced by a copy with
+        the new quantity, so views, search results and other indexes taken
+        from the old frame keep seeing the values they were taken from.
+
+        Args:
+            position: Row position in the DataFrame
+            quantity: New stock quantity
+
+        Returns:
+            The new DataFrame (also ``self.df``); swap it in for the old one
+        """
+        old_df = self.df
+        quantities = old_df['quantity'].to_numpy(copy=True)
+        old_quantity = quantities[position]
+        quantities[position] = quantity
+        self.df = old_df.assign(quantity=pd.array(quantities, dtype=old_df['quantity'].dtype))
+
+        self._move_quantities([position], [old_quantity], [quantities[position]])
+        self._adjust_values(
+            [position], value_contributions(old_df, [position]), value_contributions(self.df, [position])
+        )
+        self._records.pop(position, None)
+        return self.df
+
+    def low_stock_positions(self, threshold: int) -> np.ndarray:
+        """
+        Positions of rows with quantity at or below a threshold.
+
+        Args:
+            threshold: Quantity threshold
+
+        Returns:
+            Row positions, lowest quantity first
+        """
+        end = np.searchsorted(self.sorted_quantities, threshold, side='right')
+        return self.quantity_order[:end]
+
+    def overstock_positions(self, threshold: int) -> np.ndarray:
+        """
+        Positions of rows with quantity at or above a threshold.
+
+        Args:
+            threshold: Quantity threshold
+
+        Returns:
+            Row positions, highest quantity first
+        """
+        start = np.searchsorted(self.sorted_quantities, threshold, side='left')
+        return self.quantity_order[start:][::-1]
+
+    def top_k_low_stock(self, k: int) -> np.ndarray:
+        """
+        Positions of the k rows with the lowest quantity.
+
+        Args:
+            k: Number of rows
+
+        Returns:
+            Row positions, lowest quantity first
+        """
+        return self.quantity_order[:max(0, k)]
+
+    def valuation(self, by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Inventory value from the running totals, without touching the rows.
+
+        Args:
+            by: None for grand totals, or 'department' / 'supplier' for a breakdown
+
+        Returns:
+            Dictionary with cost_value, retail_value and potential_profit, or
+            with ``by``, a dictionary of such dictionaries keyed by group
+        """
+        def describe(cost_value: float, retail_value: float) -> Dict[str, float]:
+            return {
+                'cost_value': float(cost_value),
+                'retail_value': float(retail_value),
+                'potential_profit': float(retail_value - cost_value)
+            }
+
+        if by is None:
+            return describe(*self.value_totals[''])
+        return {
+            key: describe(*totals)
+            for key, totals in zip(self.groups[by], self.value_totals[by])
+        }
+
+    def price_range_positions(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Positions of rows priced within [low, high].
+
+        Args:
+            low: Minimum price (None for no lower bound)
+            high: Maximum price (None for no upper bound)
+
+        Returns:
+            Row positions, cheapest first
+        """
+        return self.price_order[_range_slice(self.sorted_prices, low, high)]
+
+    def margin_range_positions(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Positions of rows whose margin is within [low, high].
+
+        Args:
+            low: Minimum margin as a fraction of price (None for no lower bound)
+            high: Maximum margin (None for no upper bound)
+
+        Returns:
+            Row positions, lowest margin first
+        """
+        return self.margin_order[_range_slice(self.sorted_margins, low, high)]
+
+    @property
+    def names(self) -> NameSearchIndex:
+        """Trigram index over product names, built on first access"""
+        if self._names is None:
+            self._names = NameSearchIndex(self.df['product_name'])
+        return self._names
+
+    @property
+    def has_name_search(self) -> bool:
+        """Whether the product name search index has been built"""
+        return self._names is not None
+
+    def search_name(self, query: str, limit: int = 20) -> List[int]:
+        """
+        Find products by name, tolerating typos and partial words.
+
+        Args:
+            query: Text to search for
+            limit: Maximum number of results
+
+        Returns:
+            Row positions of the best matches, best first
+        """
+        return [position for position, _ in self.names.search(query, limit)]
+
+    def with_updates(self, new_df: pd.DataFrame, updated_positions: List[int]) -> 'InventoryIndex':
+        """
+        Derive an index for a copy of the DataFrame in which some rows changed in place.
+
+        The current index is left untouched so readers can keep using it until
+        the caller swaps in the new one. Only structures affected by the updated
+        rows are rebuilt; if rows were inserted or deleted, build a fresh index
+        instead.
+
+        Args:
+            new_df: DataFrame with the same rows in the same positions
+            updated_positions: Positions of rows whose values changed
+
+        Returns:
+            Index over ``new_df``
+        """
+        index = copy.copy(self)
+        index.df = new_df
+
+        positions = list(updated_positions)
+        for column, positions_attr, duplicates_attr in (
+            ('barcode', 'barcode_positions', 'duplicate_barcodes'),
+            ('sku', 'sku_positions', 'duplicate_skus'),
+        ):
+            old_keys = self.df[column].iloc[positions]
+            new_keys = new_df[column].iloc[positions]
+            if not old_keys.reset_index(drop=True).equals(new_keys.reset_index(drop=True)):
+                key_map, duplicates = _build_key_map(new_df[column])
+                setattr(index, positions_attr, key_map)
+                setattr(index, duplicates_attr, duplicates)
+
+        groups_changed = False
+        for column in self.groups:
+            old_values = self.df[column].iloc[positions].astype(object).reset_index(drop=True)
+            new_values = new_df[column].iloc[positions].astype(object).reset_index(drop=True)
+            if not old_values.equals(new_values):
+                if not groups_changed:
+                    index.groups = dict(self.groups)
+                    index.group_codes = dict(self.group_codes)
+                    groups_changed = True
+                index.groups[column] = _build_groups(new_df[column])
+                index.group_codes[column] = _group_codes(index.groups[column], len(new_df))
+
+        for column in ('price', 'cost'):
+            old_values = self.df[column].iloc[positions].reset_index(drop=True)
+            new_values = new_df[column].iloc[positions].reset_index(drop=True)
+            if not old_values.equals(new_values):
+                index._sort_prices()
+                break
+
+        old_quantities = self.df['quantity'].iloc[positions].tolist()
+        new_quantities = new_df['quantity'].iloc[positions].tolist()
+        if old_quantities != new_quantities:
+            index._move_quantities(positions, old_quantities, new_quantities)
+
+        if groups_changed:
+            # Group numbering changed; total everything again
+            index._total_values()
+        else:
+            index._adjust_values(
+                positions, value_contributions(self.df, positions), value_contributions(new_df, positions)
+            )
+
+        # A built name index is kept current so the next search doesn't pay for it
+        if self._names is not None:
+            old_names = self.df['product_name'].iloc[positions].reset_index(drop=True)
+            new_names = new_df['product_name'].iloc[positions].reset_index(drop=True)
+            if not old_names.equals(new_names):
+                index._names = NameSearchIndex(new_df['product_name'])
+
+        changed = set(positions)
+        index._records = {
+            position: record for position, record in self._records.items()
+            if position not in changed
+        }
+        return index
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """
+        Get the record dict for a row position.
+
+        Args:
+            position: Row position in the DataFrame
+
+        Returns:
+            A copy of the row as a dictionary
+        """
+        record = self._records.get(position)
+        if record is None:
+            record = frame_records(self.df.iloc[[position]])[0]
+            self._records[position] = record
+        # Hand out copies so callers can't corrupt the cache
+        return dict(record)
+
+    def position_of_barcode(self, barcode: str) -> Optional[int]:
+        """Row position of the first item with this barcode, or None."""
+        return self.barcode_positions.get(str(barcode).strip())
+
+    def positions_of_barcodes(self, barcodes: List[str]) -> np.ndarray:
+        """
+        Row positions for many normalized barcodes in one pass.
+
+        Args:
+            barcodes: Barcodes, already stripped
+
+        Returns:
+            Array aligned with ``barcodes`` (-1 where not found)
+        """
+        get = self.barcode_positions.get
+        return np.fromiter((get(barcode, -1) for barcode in barcodes), dtype=np.int64, count=len(barcodes))
+
+    def position_of_sku(self, sku: str) -> Optional[int]:
+        """Row position of the first item with this SKU, or None."""
+        return self.sku_positions.get(str(sku).strip())
+
+    def lookup_barcode(self, barcode: str) -> Optional[Dict[str, Any]]:
+        """
+        Find an item by its barcode.
+
+        Args:
+            barcode: Barcode to search for
+
+        Returns:
+            Dictionary with item data or None if not found
+        """
+        position = self.position_of_barcode(barcode)
+        return None if position is None else self.record(position)
+
+    def lookup_sku(self, sku: str) -> Optional[Dict[str, Any]]:
+        """
+        Find an item by its SKU.
+
+        Args:
+            sku: SKU to search for
+
+        Returns:
+            Dictionary with item data or None if not found
+        """
+        position = self.position_of_sku(sku)
+        return None if position is None else self.record(position)
+
+    def group_keys(self, column: str) -> List[str]:
+        """
+        Sorted distinct values of a grouped column.
+
+        Args:
+            column: 'department' or 'supplier'
+
+        Returns:
+            List of values
+        """
+        return list(self.groups[column])
+
+    def group_positions(self, column: str, value: str) -> np.ndarray:
+        """
+        Row positions having a value in a grouped column.
+
+        Args:
+            column: 'department' or 'supplier'
+            value: Value to look up
+
+        Returns:
+            Ascending row positions (empty if the value doesn't occur)
+        """
+        return self.groups[column].get(value, np.empty(0, dtype=np.int64))
+
+    def in_group(self, column: str, value: str, positions: np.ndarray) -> np.ndarray:
+        """
+        Check which rows have a value in a grouped column.
+
+        Args:
+            column: 'department' or 'supplier'
+            value: Value to check for
+            positions: Row positions to check
+
+        Returns:
+            Boolean array aligned with ``positions``
+        """
+        groups = self.groups[column]
+        if value not in groups:
+            return np.zeros(len(positions), dtype=bool)
+        code = list(groups).index(value)
+        return self.group_codes[column][positions] == code
+
+    def duplicates(self) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Report keys shared by more than one row.
+
+        Returns:
+            Dictionary with 'barcode' and 'sku' maps of key -> row positions
+        """
+        return {
+            'barcode': dict(self.duplicate_barcodes),
+            'sku': dict(self.duplicate_skus)
+        }
@@ -0,0 +1,204 @@
+"""
+Share one copy of the inventory between scanprint instances on the same host.
+
+A publisher writes the inventory as an uncompressed Arrow IPC file into a
+shared directory, one file per version, and then atomically points the
+``CURRENT`` file at it. Stations memory-map the current version and wrap the
+mapped Arrow buffers in ArrowDtype columns without copying, so the operating
+system keeps a single copy in its page cache however many stations map it.
+
+Example:
+    python -m utils.inventory_shared inventory/marktpos_export.csv /dev/shm/scanprint --watch
+"""
+
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from typing import List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CURRENT_FILE = 'CURRENT'
+
+
+def _require_pyarrow() -> None:
+    if not HAS_PYARROW:
+        raise ImportError("Shared inventory requires pyarrow (pip install pyarrow)")
+
+
+def _version_path(shared_dir: str, version: int) -> str:
+    return os.path.join(shared_dir, f"inventory-{version:08d}.arrow")
+
+
+def current_version(shared_dir: str) -> Optional[int]:
+    """
+    Read the version currently published in a shared directory.
+
+    Args:
+        shared_dir: Shared inventory directory
+
+    Returns:
+        Version number, or None if nothing has been published
+    """
+    try:
+        with open(os.path.join(shared_dir, CURRENT_FILE), 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def publish_inventory(inventory_df: pd.DataFrame, shared_dir: str, keep: int = 3) -> int:
+    """
+    Publish an inventory as the next version in a shared directory.
+
+    The version file is fully written before ``CURRENT`` is switched to it,
+    so stations never map a partial file. Older versions beyond ``keep`` are
+    removed; stations still mapping one keep their mapping (on POSIX systems).
+
+    Args:
+        inventory_df: Inventory DataFrame to publish
+        shared_dir: Shared inventory directory (created if needed)
+        keep: Number of versions to keep on disk
+
+    Returns:
+        The new version number
+    """
+    _require_pyarrow()
+    os.makedirs(shared_dir, exist_ok=True)
+
+    version = (current_version(shared_dir) or 0) + 1
+    path = _version_path(shared_dir, version)
+    table = pa.Table.from_pandas(inventory_df, preserve_index=False)
+
+    # Uncompressed, so readers can use the mapped buffers as they are
+    with pa.OSFile(path + '.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path + '.tmp', path)
+
+    current_path = os.path.join(shared_dir, CURRENT_FILE)
+    with open(current_path + '.tmp', 'w') as f:
+        f.write(str(version))
+    os.replace(current_path + '.tmp', current_path)
+
+    for old_version in _published_versions(shared_dir)[:-keep]:
+        try:
+            os.remove(_version_path(shared_dir, old_version))
+        except OSError:
+            # Still open elsewhere (e.g. on Windows); try again next time
+            pass
+
+    return version
+
+
+def _published_versions(shared_dir: str) -> List[int]:
+    versions = []
+    for name in os.listdir(shared_dir):
+        if name.startswith('inventory-') and name.endswith('.arrow'):
+            try:
+                versions.append(int(name[len('inventory-'):-len('.arrow')]))
+            except ValueError:
+                continue
+    return sorted(versions)
+
+
+class SharedInventory:
+    """
+    Station-side view of a shared inventory directory.
+
+    ``load()`` maps the current version; ``refresh()`` maps a newer one if it
+    has been published. The returned DataFrames have ArrowDtype columns backed
+    by the mapped file, so they are read-only in practice and cost almost no
+    private memory.
+    """
+
+    def __init__(self, shared_dir: str):
+        """
+        Initialize the view.
+
+        Args:
+            shared_dir: Shared inventory directory
+        """
+        _require_pyarrow()
+        self.shared_dir = shared_dir
+        self.version: Optional[int] = None
+        self.inventory_df: Optional[pd.DataFrame] = None
+
+    def _map(self, version: int) -> pd.DataFrame:
+        source = pa.memory_map(_version_path(self.shared_dir, version), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def load(self) -> Tuple[int, pd.DataFrame]:
+        """
+        Map the currently published inventory.
+
+        Returns:
+            Tuple of (version, inventory DataFrame)
+
+        Raises:
+            FileNotFoundError: If no inventory has been published yet
+        """
+        for _ in range(3):
+            version = current_version(self.shared_dir)
+            if version is None:
+                raise FileNotFoundError(f"No shared inventory published in {self.shared_dir}")
+            try:
+                inventory_df = self._map(version)
+            except FileNotFoundError:
+                # Superseded and cleaned up between reading CURRENT and mapping it
+                continue
+            self.version, self.inventory_df = version, inventory_df
+            return version, inventory_df
+        raise FileNotFoundError(f"Shared inventory in {self.shared_dir} kept changing while loading")
+
+    def refresh(self) -> Optional[pd.DataFrame]:
+        """
+        Map a newer version if one has been published.
+
+        Returns:
+            The new inventory DataFrame, or None if the current one is up to date
+        """
+        version = current_version(self.shared_dir)
+        if version is None or version == self.version:
+            return None
+        return self.load()[1]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .inventory import load_inventory
+    from .inventory_cache import file_fingerprint
+
+    parser = argparse.ArgumentParser(description="Publish a MarktPOS export for scanprint stations")
+    parser.add_argument("csv", help="Path to the MarktPOS CSV export")
+    parser.add_argument("shared_dir", help="Shared inventory directory (e.g. under /dev/shm)")
+    parser.add_argument("--compact", action="store_true", help="Publish with compact column types")
+    parser.add_argument("--watch", action="store_true", help="Republish whenever the export changes")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between checks with --watch")
+    args = parser.parse_args(argv)
+
+    published = None
+    while True:
+        try:
+            fingerprint = file_fingerprint(args.csv, with_hash=False)
+            if fingerprint != published:
+                version = publish_inventory(load_inventory(args.csv, compact=args.compact), args.shared_dir)
+                published = fingerprint
+                print(f"Published {args.csv} as version {version}", file=sys.stderr)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not publish inventory: {e}", file=sys.stderr)
+            if not args.watch:
+                return 1
+        if not args.watch:
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
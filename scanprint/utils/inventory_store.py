@@ -0,0 +1,349 @@
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .inventory_cache import file_fingerprint
+from .inventory_stream import iter_inventory_chunks
+
+# Bump when the table layout or the import changes
+STORE_VERSION = 1
+
+STORE_COLUMNS = [
+    "product_name", "sku", "barcode", "department", "price", "cost",
+    "quantity", "description", "supplier"
+]
+
+# Same expression in the index and the queries, so SQLite can use the index
+MARGIN_SQL = "(price - cost) / price"
+
+_SCHEMA = f"""
+CREATE TABLE inventory (
+    position INTEGER PRIMARY KEY,
+    product_name TEXT,
+    sku TEXT NOT NULL,
+    barcode TEXT NOT NULL,
+    department TEXT,
+    price REAL,
+    cost REAL,
+    quantity INTEGER NOT NULL,
+    description TEXT,
+    supplier TEXT
+);
+CREATE INDEX idx_inventory_barcode ON inventory (barcode);
+CREATE INDEX idx_inventory_sku ON inventory (sku);
+CREATE INDEX idx_inventory_department ON inventory (department);
+CREATE INDEX idx_inventory_supplier ON inventory (supplier);
+CREATE INDEX idx_inventory_quantity ON inventory (quantity);
+CREATE INDEX idx_inventory_price ON inventory (price);
+CREATE INDEX idx_inventory_margin ON inventory ({MARGIN_SQL}) WHERE price > 0;
+CREATE TABLE store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_SELECT = f"SELECT {', '.join(STORE_COLUMNS)} FROM inventory"
+
+
+def import_inventory(csv_path: str, db_path: str, chunksize: int = 100_000) -> None:
+    """
+    Import a MarktPOS export into an indexed SQLite inventory file.
+
+    The CSV is streamed in chunks (see iter_inventory_chunks) into a new file
+    that replaces ``db_path`` only once it is complete, so processes reading
+    the old store are never exposed to a partial import.
+
+    Args:
+        csv_path: Path to the MarktPOS CSV export
+        db_path: Path of the SQLite file to create or replace
+        chunksize: Rows per insert batch
+
+    Raises:
+        FileNotFoundError: If the inventory file doesn't exist
+        ValueError: If the CSV is missing required columns
+    """
+    source = file_fingerprint(csv_path)
+    # A private file next to the target, so concurrent imports don't share one
+    tmp_path = f"{db_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        _write_store(csv_path, tmp_path, source, chunksize)
+        os.replace(tmp_path, db_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_store(csv_path: str, tmp_path: str, source: Dict[str, Any], chunksize: int) -> None:
+    """Fill a new, empty SQLite file with the export's rows, indexes and metadata"""
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        # Indexes are created after the rows are in, which is much faster
+        table, indexes = _SCHEMA.split(';', 1)
+        connection.execute(table)
+
+        position = 0
+        placeholders = ', '.join('?' * (len(STORE_COLUMNS) + 1))
+        for chunk in iter_inventory_chunks(csv_path, chunksize):
+            chunk = chunk.reindex(columns=STORE_COLUMNS)
+            # Missing values arrive as NaN, which SQLite stores as NULL
+            rows = zip(range(position, position + len(chunk)), *(chunk[c].tolist() for c in STORE_COLUMNS))
+            connection.executemany(f"INSERT INTO inventory VALUES ({placeholders})", rows)
+            position += len(chunk)
+
+        connection.executescript(indexes)
+        connection.executemany(
+            "INSERT INTO store_meta VALUES (?, ?)",
+            [('version', str(STORE_VERSION)), ('source', json.dumps(source))]
+        )
+        connection.commit()
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+def store_is_current(csv_path: str, db_path: str) -> bool:
+    """
+    Check whether a store was imported from the current version of an export.
+
+    Args:
+        csv_path: Path to the MarktPOS CSV export
+        db_path: Path of the SQLite inventory file
+
+    Returns:
+        True if the store exists and matches the export's size and content
+    """
+    if not os.path.exists(db_path):
+        return False
+    try:
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM store_meta").fetchall())
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return False
+
+    if meta.get('version') != str(STORE_VERSION):
+        return False
+    source = json.loads(meta['source'])
+    quick = file_fingerprint(csv_path, with_hash=False)
+    if quick['size'] != source['size']:
+        return False
+    if quick['mtime_ns'] == source['mtime_ns']:
+        return True
+    return file_fingerprint(csv_path)['sha256'] == source['sha256']
+
+
+class InventoryStore:
+    """
+    Read-only inventory backed by an indexed SQLite file.
+
+    Offers the same queries as the DataFrame helpers in ``inventory.py``,
+    answered through SQLite indexes instead of scans. Connections are opened
+    read-only with memory-mapped I/O, so every process serving the same file
+    shares the operating system's page cache instead of holding its own copy
+    of the inventory.
+    """
+
+    def __init__(self, db_path: str, mmap_size: int = 256 * 1024 * 1024):
+        """
+        Open the store.
+
+        Args:
+            db_path: Path of the SQLite file created by import_inventory
+            mmap_size: Bytes of the file to memory-map
+
+        Raises:
+            FileNotFoundError: If the store file doesn't exist
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Inventory store not found: {db_path}")
+
+        self.db_path = db_path
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self.connection.execute("PRAGMA query_only=ON")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'InventoryStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._scalar("SELECT COUNT(*) FROM inventory")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _rows(self, query: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.connection.execute(query, tuple(params)).fetchall()
+
+    def _scalar(self, query: str, params: Iterable[Any] = ()) -> Any:
+        rows = self._rows(query, params)
+        return rows[0][0] if rows else None
+
+    def _frame(self, where: str = "", params: Iterable[Any] = (), order: str = "position",
+               limit: Optional[int] = None) -> pd.DataFrame:
+        query = f"{_SELECT} {where} ORDER BY {order}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        rows = self._rows(query, params)
+        return pd.DataFrame([tuple(row) for row in rows], columns=STORE_COLUMNS)
+
+    def _first(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        rows = self._rows(f"{_SELECT} WHERE {column} = ? ORDER BY position LIMIT 1", (str(value).strip(),))
+        return dict(rows[0]) if rows else None
+
+    def search_by_barcode(self, barcode: str) -> Optional[Dict[str, Any]]:
+        """Find an item by its barcode (see inventory.search_by_barcode)"""
+        return self._first('barcode', barcode)
+
+    def search_by_sku(self, sku: str) -> Optional[Dict[str, Any]]:
+        """Find an item by its SKU (see inventory.search_by_sku)"""
+        return self._first('sku', sku)
+
+    def search_by_barcodes(self, barcodes: Iterable[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Find many items by barcode at once (see inventory.search_by_barcodes)"""
+        barcodes = [str(barcode).strip() for barcode in barcodes]
+        barcodes = [barcode for barcode in barcodes if barcode]
+
+        found: Dict[str, Dict[str, Any]] = {}
+        unique = list(dict.fromkeys(barcodes))
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            rows = self._rows(
+                f"{_SELECT} WHERE barcode IN ({', '.join('?' * len(batch))}) ORDER BY position DESC",
+                batch
+            )
+            # Descending, so the first row of each barcode is written last
+            for row in rows:
+                found[row['barcode']] = dict(row)
+
+        records = [dict(found[barcode]) for barcode in barcodes if barcode in found]
+        not_found = [barcode for barcode in barcodes if barcode not in found]
+        return records, not_found
+
+    def search_by_name(self, name: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """Search for items by product name, case-insensitive partial match"""
+        pattern = '%' + name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return self._frame("WHERE product_name LIKE ? ESCAPE '\\'", (pattern,), limit=limit)
+
+    def get_departments(self) -> List[str]:
+        """Sorted list of departments"""
+        return [row[0] for row in self._rows(
+            "SELECT DISTINCT department FROM inventory WHERE department IS NOT NULL ORDER BY department"
+        )]
+
+    def filter_by_department(self, department: str) -> pd.DataFrame:
+        """Items in a department"""
+        return self._frame("WHERE department = ?", (department,))
+
+    def get_suppliers(self) -> List[str]:
+        """Sorted list of suppliers"""
+        return [row[0] for row in self._rows(
+            "SELECT DISTINCT supplier FROM inventory WHERE supplier IS NOT NULL ORDER BY supplier"
+        )]
+
+    def filter_by_supplier(self, supplier: str) -> pd.DataFrame:
+        """Items from a supplier"""
+        return self._frame("WHERE supplier = ?", (supplier,))
+
+    def get_low_stock_items(self, threshold: int = 10) -> pd.DataFrame:
+        """Items with quantity at or below a threshold, lowest first"""
+        return self._frame("WHERE quantity <= ?", (threshold,), order="quantity, position")
+
+    def get_overstock_items(self, threshold: int = 100) -> pd.DataFrame:
+        """Items with quantity at or above a threshold, highest first"""
+        return self._frame("WHERE quantity >= ?", (threshold,), order="quantity DESC, position DESC")
+
+    def top_k_low_stock(self, k: int = 20) -> pd.DataFrame:
+        """The k items with the lowest quantity"""
+        return self._frame(order="quantity, position", limit=max(0, k))
+
+    def filter_by_price_range(
+        self,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        department: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Items priced within [low, high], cheapest first"""
+        return self._range("price", low, high, department, "price IS NOT NULL")
+
+    def filter_by_margin(
+        self,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        department: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Items whose margin, (price - cost) / price, is within [low, high], lowest first"""
+        return self._range(MARGIN_SQL, low, high, department, "price > 0 AND cost IS NOT NULL")
+
+    def _range(self, expression: str, low: Optional[float], high: Optional[float],
+               department: Optional[str], base: str) -> pd.DataFrame:
+        conditions, params = [base], []
+        if low is not None:
+            conditions.append(f"{expression} >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"{expression} <= ?")
+            params.append(high)
+        if department is not None:
+            conditions.append("department = ?")
+            params.append(department)
+        return self._frame("WHERE " + " AND ".join(conditions), params, order=f"{expression}, position")
+
+    def calculate_inventory_value(self) -> Dict[str, float]:
+        """Total value of inventory at cost and retail prices"""
+        row = self._rows("SELECT TOTAL(cost * quantity), TOTAL(price * quantity) FROM inventory")[0]
+        return {
+            'cost_value': row[0],
+            'retail_value': row[1],
+            'potential_profit': row[1] - row[0]
+        }
+
+    def calculate_inventory_value_by(self, by: str = 'department') -> Dict[str, Dict[str, float]]:
+        """Inventory value at cost and retail per department or supplier"""
+        if by not in ('department', 'supplier'):
+            raise ValueError(f"Cannot group inventory value by '{by}'")
+        rows = self._rows(
+            f"SELECT {by}, TOTAL(cost * quantity), TOTAL(price * quantity) FROM inventory "
+            f"WHERE {by} IS NOT NULL GROUP BY {by} ORDER BY {by}"
+        )
+        return {
+            row[0]: {
+                'cost_value': row[1],
+                'retail_value': row[2],
+                'potential_profit': row[2] - row[1]
+            }
+            for row in rows
+        }
+
+
+def open_inventory_store(csv_path: str, db_path: Optional[str] = None, **store_options: Any) -> InventoryStore:
+    """
+    Open the SQLite store for an export, importing it first if it is missing or stale.
+
+    Args:
+        csv_path: Path to the MarktPOS CSV export
+        db_path: Store file (defaults to the CSV path with a .sqlite suffix)
+        **store_options: Keyword arguments for InventoryStore
+
+    Returns:
+        Open, read-only InventoryStore
+    """
+    if db_path is None:
+        db_path = os.path.splitext(csv_path)[0] + '.sqlite'
+    if not store_is_current(csv_path, db_path):
+        import_inventory(csv_path, db_path)
+    return InventoryStore(db_path, **store_options)
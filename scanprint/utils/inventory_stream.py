@@ -0,0 +1,309 @@
+import csv
+import os
+import pandas as pd
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .inventory import (REQUIRED_COLUMNS, CATEGORY_COLUMNS, compact_inventory,
+                        normalize_inventory)
+
+try:
+    from pyarrow import csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Optional export columns the app uses; anything else in the file is skipped
+OPTIONAL_COLUMNS = ["Description", "Supplier"]
+
+NUMERIC_COLUMNS = ["Price", "Cost", "Quantity"]
+
+# Approximate bytes of CSV text per row, used to size pyarrow read blocks
+_BYTES_PER_ROW_ESTIMATE = 128
+
+Issue = Dict[str, Any]
+
+
+def read_inventory_header(filepath: str) -> List[str]:
+    """
+    Read and validate the header row of a MarktPOS export.
+
+    Args:
+        filepath: Path to the CSV file
+
+    Returns:
+        Column names in file order
+
+    Raises:
+        FileNotFoundError: If the inventory file doesn't exist
+        ValueError: If the file is empty or missing required columns
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Inventory file not found: {filepath}")
+
+    with open(filepath, 'r', newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), None)
+
+    if not header:
+        raise ValueError(f"Inventory file is empty: {filepath}")
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+    return header
+
+
+class _LineMapper:
+    """
+    Find the line number of a row from its position in the file.
+
+    pyarrow doesn't report line numbers, and with quoted newlines rows and
+    lines don't correspond one to one, so the file is re-read with csv.reader
+    when a line is needed. The reader only moves forward (it starts over if
+    asked for an earlier row), so reporting in file order costs at most one
+    extra pass, and nothing when every row is clean.
+    """
+
+    def __init__(self, filepath: str, field_count: int):
+        self.filepath = filepath
+        self.field_count = field_count
+        self._file = None
+        self._reader = None
+
+    def _reset(self) -> None:
+        self.close()
+        self._file = open(self.filepath, 'r', newline='', encoding='utf-8-sig')
+        self._reader = csv.reader(self._file)
+        next(self._reader, None)
+        # Index of the last data record read (blank lines excluded), and of
+        # the last well-formed row, with their lines
+        self._record, self._record_line = -1, None
+        self._row, self._row_line = -1, None
+
+    def _advance(self) -> bool:
+        record = next(self._reader, None)
+        if record is None:
+            return False
+        if record:
+            self._record += 1
+            self._record_line = self._reader.line_num
+            if len(record) == self.field_count:
+                self._row += 1
+                self._row_line = self._record_line
+        return True
+
+    def line_of_row(self, row: int) -> Optional[int]:
+        """Line of the row-th well-formed data row (0-based)"""
+        if self._reader is None or row < self._row:
+            self._reset()
+        while self._row < row:
+            if not self._advance():
+                return None
+        return self._row_line
+
+    def line_of_record(self, record: int) -> Optional[int]:
+        """Line of the record-th data record, well-formed or not (0-based)"""
+        if self._reader is None or record < self._record:
+            self._reset()
+        while self._record < record:
+            if not self._advance():
+                return None
+        return self._record_line
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = self._reader = None
+
+
+def _check_numbers(chunk: pd.DataFrame, line_of: Callable[[int], Optional[int]], on_issue: Callable[[Issue], None]) -> None:
+    """Report values in numeric columns that will be coerced to missing"""
+    issues = []
+    for column in NUMERIC_COLUMNS:
+        raw = chunk[column]
+        present = raw.notna() & (raw.str.strip() != '')
+        bad = present & pd.to_numeric(raw, errors='coerce').isna()
+        for position in bad.to_numpy().nonzero()[0]:
+            issues.append((int(position), column))
+
+    # In row order, as line lookups only move forward
+    for position, column in sorted(issues):
+        on_issue({
+            'line': line_of(position),
+            'sku': chunk['SKU'].iloc[position],
+            'reason': f"{column} is not a number: {chunk[column].iloc[position]!r}"
+        })
+
+
+def _pyarrow_chunks(
+    filepath: str,
+    header: List[str],
+    columns: List[str],
+    chunksize: int,
+    on_issue: Callable[[Issue], None]
+) -> Iterator[pd.DataFrame]:
+    line_mapper = _LineMapper(filepath, len(header))
+
+    def invalid_row(row: Any) -> str:
+        # row.number counts non-blank records, starting with the header at 1
+        on_issue({
+            'line': line_mapper.line_of_record(row.number - 2) if row.number is not None else None,
+            'sku': None,
+            'reason': f"expected {row.expected_columns} fields, found {row.actual_columns}: {row.text[:80]!r}"
+        })
+        return 'skip'
+
+    reader = pa_csv.open_csv(
+        filepath,
+        read_options=pa_csv.ReadOptions(block_size=max(1 << 20, chunksize * _BYTES_PER_ROW_ESTIMATE)),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=invalid_row),
+        # Read everything as text so coercion (and its reporting) happens here
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: 'string' for column in columns},
+            strings_can_be_null=True
+        )
+    )
+    first_row = 0
+    try:
+        for batch in reader:
+            if batch.num_rows:
+                chunk = batch.to_pandas()
+                # Index of the chunk's first row among the well-formed rows
+                chunk.attrs['first_row'] = first_row
+                first_row += batch.num_rows
+                yield chunk
+    finally:
+        line_mapper.close()
+
+
+def _csv_chunks(
+    filepath: str,
+    header: List[str],
+    columns: List[str],
+    chunksize: int,
+    on_issue: Callable[[Issue], None]
+) -> Iterator[pd.DataFrame]:
+    positions = [header.index(column) for column in columns]
+    rows: List[List[Optional[str]]] = []
+    lines: List[int] = []
+
+    with open(filepath, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for record in reader:
+            if not record:
+                continue
+            if len(record) != len(header):
+                on_issue({
+                    'line': reader.line_num,
+                    'sku': None,
+                    'reason': f"expected {len(header)} fields, found {len(record)}: {','.join(record)[:80]!r}"
+                })
+                continue
+            rows.append([record[i] if record[i] != '' else None for i in positions])
+            lines.append(reader.line_num)
+            if len(rows) >= chunksize:
+                chunk = pd.DataFrame(rows, columns=columns)
+                chunk.attrs['lines'] = lines
+                yield chunk
+                rows, lines = [], []
+
+    if rows:
+        chunk = pd.DataFrame(rows, columns=columns)
+        chunk.attrs['lines'] = lines
+        yield chunk
+
+
+def iter_inventory_chunks(
+    filepath: str,
+    chunksize: int = 100_000,
+    compact: bool = False,
+    on_issue: Optional[Callable[[Issue], None]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a MarktPOS export as normalized DataFrame chunks.
+
+    The header is validated before any rows are parsed, only the columns the
+    app uses are read, and each chunk goes through the same normalization as
+    load_inventory, so memory use is bounded by the chunk size. Barcodes and
+    SKUs are kept exactly as written (leading zeros included).
+
+    Args:
+        filepath: Path to the CSV file
+        chunksize: Rows per chunk (approximate with pyarrow, which splits by bytes)
+        compact: Convert each chunk with compact_inventory
+        on_issue: Called with a dict (line, sku, reason) for each malformed row
+            or unparseable number; malformed rows are skipped
+
+    Yields:
+        Normalized inventory DataFrames
+
+    Raises:
+        FileNotFoundError: If the inventory file doesn't exist
+        ValueError: If the file is empty or missing required columns
+    """
+    header = read_inventory_header(filepath)
+    columns = [col for col in header if col in REQUIRED_COLUMNS or col in OPTIONAL_COLUMNS]
+    if on_issue is None:
+        on_issue = lambda issue: print(f"WARNING: {filepath} line {issue['line']}: {issue['reason']}")
+
+    if HAS_PYARROW:
+        chunks = _pyarrow_chunks(filepath, header, columns, chunksize, on_issue)
+    else:
+        chunks = _csv_chunks(filepath, header, columns, chunksize, on_issue)
+
+    line_mapper = _LineMapper(filepath, len(header))
+    try:
+        for chunk in chunks:
+            lines = chunk.attrs.get('lines')
+            if lines is not None:
+                line_of = lines.__getitem__
+            else:
+                first_row = chunk.attrs['first_row']
+                line_of = lambda position: line_mapper.line_of_row(first_row + position)
+            _check_numbers(chunk, line_of, on_issue)
+            chunk = normalize_inventory(chunk)
+            yield compact_inventory(chunk) if compact else chunk
+    finally:
+        line_mapper.close()
+
+
+def load_inventory_streaming(
+    filepath: str,
+    chunksize: int = 100_000,
+    compact: bool = False,
+    on_issue: Optional[Callable[[Issue], None]] = None
+) -> pd.DataFrame:
+    """
+    Load a MarktPOS export chunk by chunk.
+
+    Suited to very large exports: the raw text of only one chunk is held at a
+    time, and with ``compact`` each chunk is shrunk before the next is read.
+
+    Args:
+        filepath: Path to the CSV file
+        chunksize: Rows per chunk
+        compact: Store columns in smaller types (see compact_inventory)
+        on_issue: Callback for malformed rows (see iter_inventory_chunks)
+
+    Returns:
+        DataFrame containing inventory data
+
+    Raises:
+        FileNotFoundError: If the inventory file doesn't exist
+        ValueError: If the file is empty or missing required columns
+    """
+    chunks = list(iter_inventory_chunks(filepath, chunksize, compact, on_issue))
+    if not chunks:
+        header = read_inventory_header(filepath)
+        columns = [col for col in header if col in REQUIRED_COLUMNS or col in OPTIONAL_COLUMNS]
+        empty = normalize_inventory(pd.DataFrame(columns=columns, dtype=object))
+        return compact_inventory(empty) if compact else empty
+
+    df = pd.concat(chunks, ignore_index=True)
+    if compact:
+        # Chunks may have different categories, which concat turns into plain values
+        categorical = [col for col in CATEGORY_COLUMNS if col in df.columns]
+        df = df.astype({column: 'category' for column in categorical})
+    return df
@@ -0,0 +1,233 @@
+"""
+Load the inventory from the shop's ``products`` table instead of a MarktPOS export.
+
+Works with ``TursoClient`` (clients/python/direct_turso_client.py), local or
+remote, or any object with the same ``execute(query, params)`` method. Rows
+are read in keyset pages ordered by ``id``, and later refreshes only read rows
+past an ``(updated_at, id)`` watermark, so a station stays current without
+downloading the whole table again.
+
+The products table has no barcode, department, cost or supplier; those
+columns are left blank (barcode '') or missing (NaN), so products are found
+by SKU or name rather than by scanning.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .inventory import compact_inventory, normalize_inventory
+from .inventory_index import InventoryIndex
+from .inventory_watch import InventoryDiff, apply_inventory_diff, rows_differ
+
+PRODUCT_COLUMNS = "id, name, description, price, sku, stock_quantity, status, updated_at"
+
+FULL_PAGE_QUERY = f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id > ? ORDER BY id LIMIT ?"
+
+CHANGED_PAGE_QUERY = (
+    f"SELECT {PRODUCT_COLUMNS} FROM products "
+    "WHERE updated_at > ? OR (updated_at = ? AND id > ?) "
+    "ORDER BY updated_at, id LIMIT ?"
+)
+
+CLOCK_QUERY = "SELECT CURRENT_TIMESTAMP AS now"
+
+
+def _rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return result.get("results", {}).get("rows", [])
+
+
+def products_to_inventory(products: List[Dict[str, Any]], compact: bool = False) -> pd.DataFrame:
+    """
+    Convert product rows to the DataFrame load_inventory produces.
+
+    Args:
+        products: Rows from the products table
+        compact: Store columns in smaller types (see compact_inventory)
+
+    Returns:
+        Normalized inventory DataFrame, one row per product in the given order
+    """
+    df = pd.DataFrame({
+        "Product Name": [product.get("name") for product in products],
+        "SKU": [product.get("sku") for product in products],
+        "Barcode": [None] * len(products),
+        "Department": pd.Series([np.nan] * len(products), dtype=object),
+        "Price": [product.get("price") for product in products],
+        "Cost": np.full(len(products), np.nan),
+        "Quantity": [product.get("stock_quantity") for product in products],
+        "Description": [product.get("description") for product in products],
+        "Supplier": pd.Series([np.nan] * len(products), dtype=object),
+    })
+    df = normalize_inventory(df)
+
+    if compact:
+        df = compact_inventory(df)
+
+    return df
+
+
+class TursoInventorySource:
+    """
+    Inventory kept in sync with the ``products`` table.
+
+    ``load()`` reads every product; ``refresh()`` reads only products changed
+    since the previous call and folds them into the loaded inventory with the
+    same diff machinery the CSV watcher uses. Products whose ``status`` is not
+    one of ``statuses`` are left out, and a product that changes to such a
+    status is removed on refresh. Hard deletes leave no ``updated_at`` trace,
+    so they only disappear on the next ``load()``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        page_size: int = 1000,
+        statuses: Tuple[str, ...] = ('active',),
+        compact: bool = False
+    ):
+        """
+        Initialize the source.
+
+        Args:
+            client: TursoClient (or any object with ``execute(query, params)``)
+            page_size: Products per query
+            statuses: Product statuses that belong in the inventory
+            compact: Store columns in smaller types (see compact_inventory)
+        """
+        self.client = client
+        self.page_size = page_size
+        self.statuses = set(statuses)
+        self.compact = compact
+
+        self.inventory_df: Optional[pd.DataFrame] = None
+        self.index: Optional[InventoryIndex] = None
+        # Product id of each inventory row, and the reverse map
+        self.product_ids = np.empty(0, dtype=np.int64)
+        self.positions: Dict[int, int] = {}
+        # (updated_at, id) keyset position after the latest change seen
+        self.watermark: Optional[Tuple[str, int]] = None
+
+    def _pages(
+        self,
+        query: str,
+        cursor: List[Any],
+        advance: Callable[[Dict[str, Any]], List[Any]]
+    ) -> List[Dict[str, Any]]:
+        """Read all pages of a keyset query; ``advance`` maps the last row to the next cursor"""
+        products: List[Dict[str, Any]] = []
+        while True:
+            page = _rows(self.client.execute(query, cursor + [self.page_size]))
+            products.extend(page)
+            if len(page) < self.page_size:
+                return products
+            cursor = advance(page[-1])
+
+    def _clock(self) -> Optional[str]:
+        rows = _rows(self.client.execute(CLOCK_QUERY, []))
+        return str(rows[0]["now"]) if rows else None
+
+    def _advance_watermark(self, products: List[Dict[str, Any]], read_at: Optional[str]) -> None:
+        """
+        Move the watermark to the latest change in ``products``.
+
+        updated_at has one-second resolution, so a row written later in the
+        watermark's second could carry a lower id. Unless that second had
+        already passed when the read started, the id part is reset to 0 and
+        the next refresh re-reads the whole second.
+        """
+        latest = self.watermark
+        for product in products:
+            if product.get("updated_at") is None:
+                continue
+            mark = (str(product["updated_at"]), int(product["id"]))
+            if latest is None or mark > latest:
+                latest = mark
+        if latest is not None and (read_at is None or latest[0] >= read_at):
+            latest = (latest[0], 0)
+        self.watermark = latest
+
+    def _set_rows(self, product_ids: np.ndarray) -> None:
+        self.product_ids = product_ids
+        self.positions = dict(zip(product_ids.tolist(), range(len(product_ids))))
+
+    def load(self, name_search: bool = False) -> Tuple[pd.DataFrame, InventoryIndex]:
+        """
+        Read the whole products table.
+
+        Args:
+            name_search: Build the trigram name index up front
+
+        Returns:
+            Tuple of (inventory DataFrame, InventoryIndex)
+        """
+        read_at = self._clock()
+        products = self._pages(FULL_PAGE_QUERY, [0], lambda last: [last["id"]])
+
+        self.watermark = None
+        self._advance_watermark(products, read_at)
+
+        products = [product for product in products if product.get("status") in self.statuses]
+        self.inventory_df = products_to_inventory(products, compact=self.compact)
+        self.index = InventoryIndex(self.inventory_df, name_search=name_search)
+        self._set_rows(np.array([product["id"] for product in products], dtype=np.int64))
+
+        return self.inventory_df, self.index
+
+    def refresh(self) -> Tuple[pd.DataFrame, InventoryIndex, Optional[InventoryDiff]]:
+        """
+        Apply products changed since the last load or refresh.
+
+        The loaded inventory is not modified; the returned DataFrame and index
+        replace it (swap them in together, as with the CSV watcher).
+
+        Returns:
+            Tuple of (DataFrame, InventoryIndex, diff); the diff is None when
+            nothing was loaded yet and the whole table was read instead
+        """
+        if self.inventory_df is None or self.watermark is None:
+            inventory_df, index = self.load()
+            return inventory_df, index, None
+
+        since, since_id = self.watermark
+        read_at = self._clock()
+        products = self._pages(
+            CHANGED_PAGE_QUERY, [since, since, since_id],
+            lambda last: [last["updated_at"], last["updated_at"], last["id"]]
+        )
+        self._advance_watermark(products, read_at)
+
+        known = [product for product in products if product["id"] in self.positions]
+        active = [product for product in known if product.get("status") in self.statuses]
+        inserted = [
+            product for product in products
+            if product["id"] not in self.positions and product.get("status") in self.statuses
+        ]
+        deleted_positions = np.sort(np.array(
+            [self.positions[product["id"]] for product in known if product.get("status") not in self.statuses],
+            dtype=np.int64
+        ))
+
+        # Rows re-read from an unfinished watermark second usually haven't changed
+        candidate_positions = np.array([self.positions[product["id"]] for product in active], dtype=np.int64)
+        candidate_rows = products_to_inventory(active, compact=self.compact)
+        current_rows = self.inventory_df.iloc[candidate_positions].reset_index(drop=True)
+        changed = rows_differ(current_rows, candidate_rows) if len(active) else np.zeros(0, dtype=bool)
+
+        diff = InventoryDiff(
+            inserted=products_to_inventory(inserted, compact=self.compact),
+            updated_positions=candidate_positions[changed],
+            updated_rows=candidate_rows[changed].reset_index(drop=True),
+            deleted_positions=deleted_positions
+        )
+        if not diff:
+            return self.inventory_df, self.index, diff
+
+        self.inventory_df, self.index = apply_inventory_diff(self.inventory_df, self.index, diff)
+        if len(diff.deleted_positions) or len(diff.inserted):
+            keep = np.ones(len(self.product_ids), dtype=bool)
+            keep[diff.deleted_positions] = False
+            inserted_ids = np.array([product["id"] for product in inserted], dtype=np.int64)
+            self._set_rows(np.concatenate([self.product_ids[keep], inserted_ids]))
+
+        return self.inventory_df, self.index, diff
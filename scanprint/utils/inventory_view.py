@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional
+
+from .inventory_index import frame_records
+
+
+class InventoryView:
+    """
+    Read-only selection of inventory rows that shares memory with the inventory.
+
+    Filters return a view instead of a copied DataFrame when called with
+    ``view=True``. The view keeps only the selected row positions; column
+    values are gathered when read, and ``to_frame()`` makes a DataFrame on
+    demand (a zero-copy slice when the rows are contiguous). Views reflect the
+    DataFrame they were taken from, so take them from an inventory that is
+    replaced rather than modified in place (as the reload watcher and
+    ``InventoryIndex.set_quantity`` do).
+    """
+
+    __slots__ = ('df', 'positions')
+
+    def __init__(self, inventory_df: pd.DataFrame, positions: Any):
+        """
+        Initialize the view.
+
+        Args:
+            inventory_df: Inventory DataFrame the positions refer to
+            positions: Row positions in result order
+        """
+        self.df = inventory_df
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.positions.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.positions)):
+            yield self.record(i)
+
+    def __repr__(self) -> str:
+        return f"InventoryView(rows={len(self)})"
+
+    @property
+    def empty(self) -> bool:
+        return len(self.positions) == 0
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.df.columns
+
+    def _slice(self) -> Optional[slice]:
+        """Slice equivalent to the positions, if they are ascending and contiguous"""
+        positions = self.positions
+        if len(positions) and (np.diff(positions) == 1).all():
+            return slice(int(positions[0]), int(positions[-1]) + 1)
+        return None
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Values of one column for the selected rows.
+
+        Args:
+            name: Column name
+
+        Returns:
+            Array of values in view order
+        """
+        values = self.df[name].to_numpy()
+        rows = self._slice()
+        return values[rows] if rows is not None else values[self.positions]
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """
+        Get one selected row as a dictionary.
+
+        Args:
+            i: Index within the view
+
+        Returns:
+            Dictionary with item data
+        """
+        return frame_records(self.df.iloc[[int(self.positions[i])]])[0]
+
+    def head(self, n: int = 5) -> 'InventoryView':
+        """View of the first n rows"""
+        return InventoryView(self.df, self.positions[:n])
+
+    def sort_by(self, column: str, ascending: bool = True) -> 'InventoryView':
+        """
+        Reorder the view by a column without touching the inventory.
+
+        Args:
+            column: Column to sort by
+            ascending: Sort direction
+
+        Returns:
+            New view in sorted order
+        """
+        order = np.argsort(self.column(column), kind='stable')
+        if not ascending:
+            order = order[::-1]
+        return InventoryView(self.df, self.positions[order])
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        """
+        Materialize the view as a DataFrame.
+
+        Args:
+            copy: Return an independent copy; with False, contiguous rows come
+                back as a slice of the inventory (read-only use)
+
+        Returns:
+            DataFrame with the selected rows
+        """
+        rows = self._slice()
+        if rows is not None and not copy:
+            return self.df.iloc[rows]
+        return self.df.take(self.positions)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """All selected rows as dictionaries"""
+        return frame_records(self.df.take(self.positions))
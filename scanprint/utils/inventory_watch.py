@@ -0,0 +1,295 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .inventory import load_inventory
+from .inventory_index import InventoryIndex
+
+
+def inventory_keys(inventory_df: pd.DataFrame) -> pd.Series:
+    """
+    Identify each row by SKU, falling back to the barcode for rows without one.
+
+    Args:
+        inventory_df: Inventory DataFrame
+
+    Returns:
+        Series of row keys aligned with the DataFrame
+    """
+    sku = inventory_df['sku'].astype(str)
+    barcode_keys = 'barcode:' + inventory_df['barcode'].astype(str)
+    return sku.where(sku != '', barcode_keys)
+
+
+def _categorical_columns(inventory_df: pd.DataFrame) -> List[str]:
+    return [
+        column for column, dtype in inventory_df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    ]
+
+
+def _decategorize(inventory_df: pd.DataFrame) -> pd.DataFrame:
+    """Give categorical columns plain values so frames with different categories compare"""
+    columns = _categorical_columns(inventory_df)
+    if not columns:
+        return inventory_df
+    return inventory_df.astype({column: object for column in columns})
+
+
+def rows_differ(old_values: pd.DataFrame, new_values: pd.DataFrame) -> np.ndarray:
+    """
+    Compare two aligned sets of rows column by column.
+
+    Args:
+        old_values: Rows as currently loaded
+        new_values: The same rows from the new source, in the same order
+
+    Returns:
+        Boolean array, True where any column differs (NaN on both sides is equal)
+    """
+    old_values, new_values = _decategorize(old_values), _decategorize(new_values)
+    differs = (old_values != new_values) & ~(old_values.isna() & new_values.isna())
+    return differs.any(axis=1).to_numpy()
+
+
+class InventoryDiff:
+    """Row-level differences between two inventory DataFrames"""
+
+    def __init__(
+        self,
+        inserted: pd.DataFrame,
+        updated_positions: np.ndarray,
+        updated_rows: pd.DataFrame,
+        deleted_positions: np.ndarray
+    ):
+        self.inserted = inserted
+        self.updated_positions = updated_positions
+        self.updated_rows = updated_rows
+        self.deleted_positions = deleted_positions
+
+    def __bool__(self) -> bool:
+        return bool(len(self.inserted) or len(self.updated_positions) or len(self.deleted_positions))
+
+    def summary(self) -> str:
+        return (f"{len(self.inserted)} inserted, {len(self.updated_positions)} updated, "
+                f"{len(self.deleted_positions)} deleted")
+
+
+def diff_inventory(old_df: pd.DataFrame, new_df: pd.DataFrame) -> Optional[InventoryDiff]:
+    """
+    Compare two inventories row by row, matching rows by SKU (or barcode).
+
+    Args:
+        old_df: Currently loaded inventory
+        new_df: Freshly loaded inventory
+
+    Returns:
+        The differences, or None if either side has duplicate keys or different
+        columns (the caller should then replace the inventory wholesale)
+    """
+    if list(old_df.columns) != list(new_df.columns):
+        return None
+
+    old_keys = inventory_keys(old_df)
+    new_keys = inventory_keys(new_df)
+    if old_keys.duplicated().any() or new_keys.duplicated().any():
+        return None
+
+    old_positions = pd.Series(np.arange(len(old_df)), index=old_keys.values)
+    new_positions = pd.Series(np.arange(len(new_df)), index=new_keys.values)
+
+    common = old_positions.index.intersection(new_positions.index, sort=False)
+    deleted = old_positions.index.difference(new_positions.index, sort=False)
+    inserted = new_positions.index.difference(old_positions.index, sort=False)
+
+    old_common = old_positions[common].to_numpy()
+    new_common = new_positions[common].to_numpy()
+
+    old_values = _decategorize(old_df.iloc[old_common].reset_index(drop=True))
+    new_values = _decategorize(new_df.iloc[new_common].reset_index(drop=True))
+    changed = rows_differ(old_values, new_values)
+
+    return InventoryDiff(
+        inserted=new_df.iloc[np.sort(new_positions[inserted].to_numpy())],
+        updated_positions=old_common[changed],
+        updated_rows=new_values[changed],
+        deleted_positions=np.sort(old_positions[deleted].to_numpy())
+    )
+
+
+def apply_inventory_diff(
+    inventory_df: pd.DataFrame,
+    index: Optional[InventoryIndex],
+    diff: InventoryDiff
+) -> Tuple[pd.DataFrame, InventoryIndex]:
+    """
+    Apply a diff to a copy of the inventory and derive the matching index.
+
+    The inputs are not modified, so scans running against them stay
+    consistent; swap in the returned pair in one step once it is ready.
+
+    Args:
+        inventory_df: Currently loaded inventory
+        index: Its index (None to build a fresh one)
+        diff: Differences from diff_inventory
+
+    Returns:
+        Tuple of (updated DataFrame, updated InventoryIndex)
+    """
+    # Categoricals are patched as plain values and re-encoded at the end, since
+    # the new export may bring categories the current frame doesn't have
+    categorical = _categorical_columns(inventory_df)
+    new_df = _decategorize(inventory_df).copy()
+
+    if len(diff.updated_positions):
+        for column in new_df.columns:
+            column_position = new_df.columns.get_loc(column)
+            new_df.iloc[diff.updated_positions, column_position] = diff.updated_rows[column].to_numpy()
+
+    rows_moved = bool(len(diff.deleted_positions) or len(diff.inserted))
+    if rows_moved:
+        # Deleted rows leave; inserted rows are appended in export order
+        keep = np.ones(len(new_df), dtype=bool)
+        keep[diff.deleted_positions] = False
+        new_df = pd.concat([new_df[keep], _decategorize(diff.inserted)], ignore_index=True)
+
+    if categorical:
+        new_df = new_df.astype({column: 'category' for column in categorical})
+
+    if index is None or rows_moved:
+        return new_df, InventoryIndex(new_df, name_search=index is not None and index.has_name_search)
+
+    return new_df, index.with_updates(new_df, diff.updated_positions.tolist())
+
+
+def reload_inventory(
+    filepath: str,
+    inventory_df: pd.DataFrame,
+    index: Optional[InventoryIndex] = None,
+    **load_options: Any
+) -> Tuple[pd.DataFrame, InventoryIndex, Optional[InventoryDiff]]:
+    """
+    Load a new export and fold its changes into the current inventory.
+
+    Args:
+        filepath: Path to the MarktPOS CSV export
+        inventory_df: Currently loaded inventory
+        index: Its index
+        **load_options: Keyword arguments for load_inventory (use the ones the
+            current inventory was loaded with)
+
+    Returns:
+        Tuple of (DataFrame, InventoryIndex, diff); the diff is None when the
+        new export replaced the inventory wholesale
+    """
+    new_df = load_inventory(filepath, **load_options)
+    diff = diff_inventory(inventory_df, new_df)
+
+    if diff is None:
+        name_search = index is not None and index.has_name_search
+        return new_df, InventoryIndex(new_df, name_search=name_search), None
+    if not diff:
+        return inventory_df, index if index is not None else InventoryIndex(inventory_df), diff
+
+    new_df, new_index = apply_inventory_diff(inventory_df, index, diff)
+    return new_df, new_index, diff
+
+
+class InventoryWatcher:
+    """
+    Polls an inventory export and reloads it incrementally when it changes.
+
+    A change is acted on once the file's size and mtime have been stable for
+    one polling interval, so half-written exports are not read. The reload
+    runs on the watcher's thread; ``on_reload`` receives the new DataFrame,
+    index and diff and should hand them to the UI thread for the swap.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        get_current: Callable[[], Tuple[pd.DataFrame, Optional[InventoryIndex]]],
+        on_reload: Callable[[pd.DataFrame, InventoryIndex, Optional[InventoryDiff]], None],
+        interval: float = 2.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        load_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            filepath: Path to the MarktPOS CSV export
+            get_current: Returns the currently loaded (DataFrame, index)
+            on_reload: Called with (DataFrame, index, diff) after a change
+            interval: Seconds between polls
+            on_error: Called with the exception if a reload fails
+            load_options: Keyword arguments for load_inventory
+        """
+        self.filepath = filepath
+        self.get_current = get_current
+        self.on_reload = on_reload
+        self.interval = interval
+        self.on_error = on_error
+        self.load_options = load_options or {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def start(self) -> None:
+        """Start polling on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="inventory-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        Reload now if the export changed and has settled.
+
+        Returns:
+            True if a reload was performed
+        """
+        current = self._stat()
+        if current is None or current == self._seen:
+            return False
+
+        # Wait for the writer to finish before reading
+        self._stop.wait(self.interval)
+        if self._stat() != current:
+            return False
+
+        try:
+            inventory_df, index = self.get_current()
+            new_df, new_index, diff = reload_inventory(
+                self.filepath, inventory_df, index, **self.load_options
+            )
+        except (OSError, ValueError) as e:
+            if self.on_error is not None:
+                self.on_error(e)
+            self._seen = current
+            return False
+
+        self._seen = current
+        self.on_reload(new_df, new_index, diff)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,228 @@
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+# Marks the boundary between names in the concatenated trigram source
+_SEPARATOR = ord('\n')
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Normalize product names for matching: lowercase ASCII letters and digits
+    separated by single spaces.
+
+    Args:
+        names: Product names (missing values become empty strings)
+
+    Returns:
+        Series of normalized names
+    """
+    names = names.fillna('').astype(str)
+
+    # Fold accents (e.g. "Café" -> "cafe"); only non-ASCII names need it
+    accented = names.str.contains(r'[^\x00-\x7f]', regex=True)
+    if accented.any():
+        names[accented] = (
+            names[accented].str.normalize('NFKD')
+            .str.encode('ascii', 'ignore')
+            .str.decode('ascii')
+        )
+
+    return (
+        names.str.lower()
+        .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def normalize_query(query: str) -> str:
+    """Normalize one search string the same way as normalize_names"""
+    if not query.isascii():
+        query = unicodedata.normalize('NFKD', query).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', query.lower()).strip()
+
+
+def _trigram_codes(data: np.ndarray) -> np.ndarray:
+    data = data.astype(np.int32)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+def _query_trigrams(query: str) -> np.ndarray:
+    """Trigrams of a normalized query, padded at the start only so partial words match"""
+    data = np.frombuffer((' ' + query).encode('ascii'), dtype=np.uint8)
+    if len(data) < 3:
+        return np.empty(0, dtype=np.int32)
+    return np.unique(_trigram_codes(data))
+
+
+class NameSearchIndex:
+    """
+    Trigram inverted index over product names for ranked, typo-tolerant search.
+
+    Each name is normalized and split into overlapping three-character
+    sequences; for every trigram the index stores the sorted row positions of
+    the names containing it, shortest names first (in one CSR layout:
+    ``codes``, ``offsets`` and ``postings``). A query is answered from the postings of its own trigrams,
+    so the cost depends mostly on how many names share them.
+    """
+
+    def __init__(self, names: pd.Series):
+        """
+        Build the index.
+
+        Args:
+            names: Product names in row order
+        """
+        normalized = normalize_names(names)
+        self.normalized = normalized.tolist()
+        count = len(self.normalized)
+
+        # Rank names shortest first (ties by position); postings are kept in
+        # rank order so prefix queries can read the best names off the front
+        lengths = normalized.str.len().to_numpy(dtype=np.int64)
+        by_rank = np.lexsort((np.arange(count), lengths)).astype(np.int32)
+        rank = np.empty(count, dtype=np.int64)
+        rank[by_rank] = np.arange(count)
+
+        # Encode all names into one buffer; " name \n" keeps word-boundary trigrams
+        text = '\n'.join(' ' + name + ' ' for name in self.normalized) + '\n'
+        data = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+
+        if len(data) < 3:
+            self.codes = np.empty(0, dtype=np.int32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.postings = np.empty(0, dtype=np.int32)
+            self.trigram_counts = np.zeros(count, dtype=np.int32)
+            return
+
+        codes = _trigram_codes(data)
+        is_separator = data == _SEPARATOR
+        valid = ~(is_separator[:-2] | is_separator[1:-1] | is_separator[2:])
+        rows = np.cumsum(is_separator)[:-2]
+
+        # Unique (trigram, row) pairs sorted by trigram, then row rank
+        keys = np.sort((codes[valid].astype(np.int64) << 32) | rank[rows[valid]])
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+        pair_codes = (keys >> 32).astype(np.int32)
+        self.postings = by_rank[keys & 0xFFFFFFFF]
+
+        starts = np.flatnonzero(np.r_[True, pair_codes[1:] != pair_codes[:-1]])
+        self.codes = pair_codes[starts]
+        self.offsets = np.r_[starts, len(pair_codes)].astype(np.int64)
+        self.trigram_counts = np.bincount(self.postings, minlength=count).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.normalized)
+
+    def _posting(self, code: int) -> np.ndarray:
+        slot = np.searchsorted(self.codes, code)
+        if slot == len(self.codes) or self.codes[slot] != code:
+            return self.postings[:0]
+        return self.postings[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def search(self, query: str, limit: int = 20, min_overlap: float = 0.5) -> List[Tuple[int, float]]:
+        """
+        Find the names most similar to a query.
+
+        A name is a candidate when it shares at least ``min_overlap`` of the
+        query's trigrams, which lets a mistyped character through. Candidates
+        are ranked by trigram similarity, with names that contain the query
+        as-is placed first.
+
+        Args:
+            query: Text typed by the user
+            limit: Maximum number of results
+            min_overlap: Fraction of query trigrams a name must share (0-1]
+
+        Returns:
+            List of (row position, score) pairs, best first
+        """
+        normalized = normalize_query(query)
+        if not normalized or limit <= 0:
+            return []
+
+        trigrams = _query_trigrams(normalized)
+        if len(trigrams) == 0:
+            return self._prefix_search(normalized, limit)
+
+        postings = np.concatenate([self._posting(code) for code in trigrams])
+        required = max(1, int(np.ceil(len(trigrams) * min_overlap)))
+
+        # Count shared trigrams per name; a dense count only pays off when the
+        # postings cover a good part of the inventory
+        if len(postings) * 8 > len(self.normalized):
+            shared = np.bincount(postings, minlength=len(self.normalized))
+            candidates = np.flatnonzero(shared >= required)
+            shared = shared[candidates]
+        else:
+            candidates, shared = np.unique(postings, return_counts=True)
+            keep = shared >= required
+            candidates, shared = candidates[keep], shared[keep]
+        if len(candidates) == 0:
+            return []
+
+        # Dice coefficient between query and name trigram sets
+        scores = 2.0 * shared / (len(trigrams) + self.trigram_counts[candidates])
+
+        # Names containing the query as-is rank first. Such a name holds every
+        # trigram of the unpadded query, so only those names need the substring
+        # check; it runs on the best-scoring ones before the shortlist is cut,
+        # widening the window until the shortlist could be all matches
+        shortlist = min(len(candidates), limit * 4)
+        inner = np.unique(_trigram_codes(np.frombuffer(normalized.encode('ascii'), dtype=np.uint8)))
+        lead = trigrams[~np.isin(trigrams, inner)]
+        inner_shared = shared
+        if len(lead):
+            has_lead = np.zeros(len(self.normalized), dtype=bool)
+            has_lead[self._posting(lead[0])] = True
+            inner_shared = shared - has_lead[candidates]
+        maybe = np.flatnonzero(inner_shared >= len(inner))
+
+        window = shortlist
+        while True:
+            top = maybe
+            if window < len(maybe):
+                top = maybe[np.argpartition(-scores[maybe], window - 1)[:window]]
+            contains = top[np.fromiter(
+                (normalized in self.normalized[position] for position in candidates[top]),
+                dtype=bool, count=len(top)
+            )]
+            if len(contains) >= shortlist or len(top) == len(maybe):
+                break
+            window *= 4
+        scores[contains] += 1.0
+
+        if shortlist < len(candidates):
+            top = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            candidates, scores = candidates[top], scores[top]
+
+        ranked = sorted(
+            ((int(position), float(score)) for position, score in zip(candidates, scores)),
+            key=lambda item: (-item[1], len(self.normalized[item[0]]), item[0])
+        )
+        return ranked[:limit]
+
+    def _prefix_search(self, normalized: str, limit: int) -> List[Tuple[int, float]]:
+        """Handle one-character queries, which have no trigram, by matching word prefixes"""
+        # Trigrams are ordered by their leading bytes, so all trigrams that
+        # start with " " + query form one contiguous range
+        prefix = (' ' + normalized).encode('ascii')
+        low = int.from_bytes(prefix.ljust(3, b'\x00'), 'big')
+        high = int.from_bytes(prefix.ljust(3, b'\xff'), 'big')
+        start, end = np.searchsorted(self.codes, [low, high + 1])
+        if start == end:
+            return []
+
+        # Shortest names first, as they match the query most closely. Each
+        # posting list is in that order and holds a name once, so the best
+        # names overall are among the first ``limit`` of each list
+        heads = np.concatenate([
+            self.postings[self.offsets[slot]:min(self.offsets[slot + 1], self.offsets[slot] + limit)]
+            for slot in range(start, end)
+        ])
+        heads = np.unique(heads)
+        lengths = np.fromiter((len(self.normalized[p]) for p in heads), dtype=np.int64, count=len(heads))
+        best = heads[np.lexsort((heads, lengths))[:limit]]
+        return [(int(position), 1.0) for position in best]